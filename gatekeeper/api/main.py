@@ -9,7 +9,9 @@ from pydantic import BaseModel
 from typing import List, Dict, Optional, Literal
 import sys
 import os
+import re
 from datetime import datetime
+from functools import lru_cache
 import json
 
 # Add parent directories to path for imports
@@ -65,6 +67,12 @@ active_rules: Dict[str, WAFRule] = {}
 # Session history for behavioral analysis (now using Redis!)
 session_history: Dict[str, List[Dict]] = {}  # Fallback only
 
+# Labeled metric children bound once; /inspect only calls inc()/observe()
+REQUESTS_TOTAL = cerberus_requests_total.labels(service="gatekeeper")
+ML_ANOMALY_SCORES = cerberus_ml_anomaly_score_bucket.labels(service="gatekeeper")
+SIGNATURE_MATCHES = cerberus_attack_patterns_total.labels(attack_type="signature_match")
+ML_ANOMALIES = cerberus_attack_patterns_total.labels(attack_type="ml_anomaly")
+
 
 # Request/Response models
 
@@ -132,7 +140,7 @@ async def inspect_request(req: InspectRequest):
     This is the main entry point for WAF analysis
     """
     # Increment request counter
-    cerberus_requests_total.labels(service="gatekeeper").inc()
+    REQUESTS_TOTAL.inc()
     
     # Step 1: Check against existing WAF rules
     modsecurity_score, blocked_by_rule = check_waf_rules(req)
@@ -140,7 +148,7 @@ async def inspect_request(req: InspectRequest):
     if blocked_by_rule:
         # Increment blocked counter and attack patterns
         cerberus_requests_blocked_total.inc()
-        cerberus_attack_patterns_total.labels(attack_type="signature_match").inc()
+        SIGNATURE_MATCHES.inc()
         
         return InspectResponse(
             action="block",
@@ -167,7 +175,7 @@ async def inspect_request(req: InspectRequest):
     ml_score, is_anomaly = anomaly_detector.predict(features)
     
     # Record ML anomaly score in histogram
-    cerberus_ml_anomaly_score_bucket.labels(service="gatekeeper").observe(ml_score)
+    ML_ANOMALY_SCORES.observe(ml_score)
     
     # Step 4: Behavioral analysis (using Redis session history)
     behavioral_score = 0.0
@@ -202,7 +210,7 @@ async def inspect_request(req: InspectRequest):
         cerberus_poi_tagged_total.inc()
         # Record attack pattern if ML detected anomaly
         if is_anomaly:
-            cerberus_attack_patterns_total.labels(attack_type="ml_anomaly").inc()
+            ML_ANOMALIES.inc()
     elif action == "allow":
         cerberus_requests_allowed_total.inc()
     
@@ -428,9 +436,8 @@ def check_waf_rules(req: InspectRequest) -> tuple[float, Optional[str]]:
                 score = max(score, 80.0)
         
         elif rule.match.type == "regex":
-            import re
             flags = re.IGNORECASE if rule.match.flags.get("caseless") else 0
-            if re.search(rule.match.pattern, combined_text, flags):
+            if _compile_rule_pattern(rule.match.pattern, flags).search(combined_text):
                 if rule.action == "block":
                     return 100.0, rule_id
                 score = max(score, 85.0)
@@ -441,6 +448,12 @@ def check_waf_rules(req: InspectRequest) -> tuple[float, Optional[str]]:
     return score, None
 
 
+@lru_cache(maxsize=1024)
+def _compile_rule_pattern(pattern: str, flags: int) -> re.Pattern:
+    """Compile a rule pattern once and reuse it across requests."""
+    return re.compile(pattern, flags)
+
+
 def _heuristic_modsecurity_score(combined_text: str) -> float:
     """Approximate ModSecurity scoring for common attack signatures."""
     text_lower = combined_text.lower()
@@ -587,10 +600,12 @@ def get_session_history(session_id: str) -> List[Dict]:
 def add_to_session_history(session_id: str, entry: Dict) -> None:
     """Add entry to session history in Redis and memory"""
     try:
-        # Store in Redis (keep last 20)
-        redis_client.lpush(f"session:{session_id}", entry)
-        redis_client.ltrim(f"session:{session_id}", 0, 19)
-        redis_client.expire(f"session:{session_id}", 3600)  # 1 hour TTL
+        # Store in Redis (keep last 20), one round trip
+        key = f"session:{session_id}"
+        with redis_client.pipeline() as pipe:
+            pipe.lpush(key, json.dumps(entry))
+            pipe.ltrim(key, 0, 19)
+            pipe.expire(key, 3600)  # 1 hour TTL
     except Exception as e:
         print(f"Redis add session history error: {e}")
         # Fallback to in-memory
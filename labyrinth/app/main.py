@@ -49,6 +49,9 @@ FAKE_TRANSACTIONS = generator.generate_transactions(200)
 EVIDENCE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'captures')
 os.makedirs(EVIDENCE_DIR, exist_ok=True)
 
+# Labeled request counter bound once instead of per request
+REQUESTS_TOTAL = cerberus_requests_total.labels(service="labyrinth")
+
 
 # Models
 
@@ -70,7 +73,7 @@ async def capture_middleware(request: Request, call_next):
     """Capture all requests for analysis"""
     
     # Increment request counter
-    cerberus_requests_total.labels(service="labyrinth").inc()
+    REQUESTS_TOTAL.inc()
     
     # Read request body
     body_bytes = await request.body()
@@ -77,22 +77,21 @@ class EvidenceConsumer:
                 topic="cerberus.evidence.ready",
                 group_id=self.group_id,
                 handler=self._handle_evidence_pointer,
-                auto_offset_reset='latest'
+                auto_offset_reset='latest',
+                deserializer=EvidencePointer.model_validate_json
             )
         except Exception as e:
             logger.error(f"Evidence consumption loop error: {e}")
             self.running = False
     
-    def _handle_evidence_pointer(self, message: dict):
+    def _handle_evidence_pointer(self, pointer: EvidencePointer):
         """
         Handle incoming evidence pointer
         
         Args:
-            message: Evidence pointer dict from Kafka
+            pointer: Evidence pointer, validated straight from the Kafka bytes
         """
         try:
-            pointer = EvidencePointer.model_validate(message)
-            
             logger.info(
                 f"Received evidence pointer: event={pointer.event_id}, "
                 f"session={pointer.session_id}, "
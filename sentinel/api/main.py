@@ -58,6 +58,9 @@ sandbox_manager = SandboxSecurityManager()
 
 # Storage (in production: use PostgreSQL/Redis)
 simulation_results: Dict[str, Dict] = {}
+
+# Labeled request counter bound once instead of per request
+REQUESTS_TOTAL = cerberus_requests_total.labels(service="sentinel")
 generated_rules: Dict[str, WAFRule] = {}
 attacker_profiles: Dict[str, Dict] = {}
 
@@ -110,6 +113,14 @@ class PolicyDecision(BaseModel):
     confidence: float
 
 
+# Lifecycle
+
+@app.on_event("shutdown")
+async def shutdown_simulator():
+    """Tear down warm simulation sandboxes"""
+    simulator.close()
+
+
 # API Endpoints
 
 @app.get("/health")
@@ -164,7 +175,7 @@ async def simulate_payload(
     
     Returns job_id immediately, simulation runs in background
     """
-    cerberus_requests_total.labels(service="sentinel").inc()
+    REQUESTS_TOTAL.inc()
     
     job_id = f"sim_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
     
@@ -1,11 +1,22 @@
 """
 Behavioral Profiler - Analyzes attacker actions and maps to TTPs
 """
+import re
+import sys
+from collections import Counter
 from typing import List, Dict
 from sklearn.cluster import DBSCAN
 import numpy as np
 from datetime import datetime
 
+try:
+    from ciso8601 import parse_datetime as _parse_timestamp
+except ImportError:
+    _parse_timestamp = datetime.fromisoformat
+
+# Shared default for captures without headers; only ever read via .get()
+_NO_HEADERS: Dict = {}
+
 
 class BehavioralProfiler:
     """Profile attacker behavior and map to MITRE ATT&CK TTPs"""
@@ -22,6 +33,30 @@ class BehavioralProfiler:
         "privilege_escalation": ["T1068", "T1078"],  # Exploit, Valid Accounts
         "persistence": ["T1505", "T1543"],  # Server Software Component
     }
+    # Read-only: freeze to interned frozensets so set.update() can merge directly
+    TTP_MAPPINGS = {
+        k: frozenset(sys.intern(t) for t in v) for k, v in TTP_MAPPINGS.items()
+    }
+    
+    # Payload type -> action, in priority order
+    _PAYLOAD_ACTIONS = (
+        ("sql_injection", "sql_injection_attempt"),
+        ("xss", "xss_attempt"),
+        ("command_injection", "command_injection_attempt"),
+        ("path_traversal", "path_traversal_attempt"),
+    )
+    
+    # HTTP method -> fallback action when nothing more specific matched
+    _METHOD_DEFAULTS = {
+        "GET": "reconnaissance",
+        "POST": "exploitation_attempt",
+        "PUT": "modification_attempt",
+        "PATCH": "modification_attempt",
+        "DELETE": "deletion_attempt",
+    }
+    
+    # Automated scanner signatures in User-Agent
+    _TOOL_RE = re.compile(r"sqlmap|nikto", re.IGNORECASE)
     
     def __init__(self):
         pass
@@ -39,11 +74,13 @@ class BehavioralProfiler:
         if not captures:
             return self._empty_profile()
         
-        # Extract action sequence
-        actions = [self._classify_action(c) for c in captures]
-        
-        # Map to TTPs
-        ttps = self._extract_ttps(captures)
+        # Extract action sequence and map to TTPs in a single pass
+        actions = []
+        ttp_set = set()
+        for capture in captures:
+            actions.append(self._classify_action(capture))
+            self._collect_ttps(capture, ttp_set)
+        ttps = sorted(ttp_set)
         
         # Classify intent
         intent = self._classify_intent(actions)
@@ -77,15 +114,10 @@ class BehavioralProfiler:
         
         # Check for attack payloads
         if payloads:
-            payload_types = [p.get("type", "") for p in payloads]
-            if "sql_injection" in payload_types:
-                return "sql_injection_attempt"
-            if "xss" in payload_types:
-                return "xss_attempt"
-            if "command_injection" in payload_types:
-                return "command_injection_attempt"
-            if "path_traversal" in payload_types:
-                return "path_traversal_attempt"
+            payload_types = {p.get("type", "") for p in payloads}
+            for payload_type, action in self._PAYLOAD_ACTIONS:
+                if payload_type in payload_types:
+                    return action
         
         # Check for enumeration patterns
         if "/users" in path or "/api/v1/users" in path:
@@ -102,48 +134,39 @@ class BehavioralProfiler:
             return "data_access_attempt"
         
         # Default classification
-        if method == "GET":
-            return "reconnaissance"
-        elif method == "POST":
-            return "exploitation_attempt"
-        elif method in ["PUT", "PATCH"]:
-            return "modification_attempt"
-        elif method == "DELETE":
-            return "deletion_attempt"
-        
-        return "unknown_action"
+        return self._METHOD_DEFAULTS.get(method, "unknown_action")
     
     def _extract_ttps(self, captures: List[Dict]) -> List[str]:
         """Extract MITRE ATT&CK TTPs from captures"""
         ttps = set()
         
         for capture in captures:
-            payloads = capture.get("payloads", [])
-            
-            for payload in payloads:
-                payload_type = payload.get("type", "")
-                if payload_type in self.TTP_MAPPINGS:
-                    ttps.update(self.TTP_MAPPINGS[payload_type])
-            
-            # Check for specific behaviors
-            path = capture.get("path", "")
-            
-            if "/admin" in path or "/config" in path:
-                ttps.add("T1083")  # File Discovery
-            
-            if "/login" in path:
-                ttps.add("T1110")  # Brute Force
-            
-            if "/upload" in path:
-                ttps.add("T1105")  # Ingress Tool Transfer
+            self._collect_ttps(capture, ttps)
+        
+        return sorted(ttps)
+    
+    def _collect_ttps(self, capture: Dict, ttps: set) -> None:
+        """Add the TTPs evidenced by a single capture to ``ttps``"""
+        for payload in capture.get("payloads", []):
+            payload_type = payload.get("type", "")
+            if payload_type in self.TTP_MAPPINGS:
+                ttps.update(self.TTP_MAPPINGS[payload_type])
+        
+        # Check for specific behaviors
+        path = capture.get("path", "")
+        
+        if "/admin" in path or "/config" in path:
+            ttps.add("T1083")  # File Discovery
+        
+        if "/login" in path:
+            ttps.add("T1110")  # Brute Force
         
-        return sorted(list(ttps))
+        if "/upload" in path:
+            ttps.add("T1105")  # Ingress Tool Transfer
     
     def _classify_intent(self, actions: List[str]) -> str:
         """Classify attacker's primary intent"""
-        action_counts = {}
-        for action in actions:
-            action_counts[action] = action_counts.get(action, 0) + 1
+        action_counts = Counter(actions)
         
         # Analyze action patterns
         total = len(actions)
@@ -202,11 +225,11 @@ class BehavioralProfiler:
                 score += 2.0
                 break
         
-        user_agents = [c.get("headers", {}).get("User-Agent", "") for c in captures]
-        if any("sqlmap" in ua.lower() or "nikto" in ua.lower() for ua in user_agents):
-            score += 1.0 
-        else:
-            score += 2.0 
+        tool_hit = any(
+            self._TOOL_RE.search(c.get("headers", _NO_HEADERS).get("User-Agent", ""))
+            for c in captures
+        )
+        score += 1.0 if tool_hit else 2.0
         
         if len(captures) < 10:
             score += 3.0
@@ -224,7 +247,7 @@ class BehavioralProfiler:
         
         try:
             timestamps = [
-                datetime.fromisoformat(c.get("timestamp", ""))
+                _parse_timestamp(c["timestamp"])
                 for c in captures
                 if c.get("timestamp")
             ]
@@ -239,7 +262,7 @@ class BehavioralProfiler:
     
     def _generate_summary(self, actions: List[str], ttps: List[str], intent: str) -> str:
         """Generate human-readable summary"""
-        action_summary = ", ".join(set(actions[:5])) 
+        action_summary = ", ".join(dict.fromkeys(actions[:5]))
         ttp_summary = ", ".join(ttps[:3]) if ttps else "None"
         
         summary = (
@@ -2,6 +2,7 @@
 Rule Generator - Synthesizes WAF rules from simulation results
 """
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 from datetime import datetime
 import sys
@@ -45,23 +46,8 @@ class RuleGenerator:
         
         print(f"[RULE_GEN] Generating rule for {payload_type} payload")
         
-        # Generate pattern based on payload type
-        if payload_type == "sql_injection":
-            pattern, rule_type = self._generate_sql_pattern(payload_value)
-        
-        elif payload_type == "xss":
-            pattern, rule_type = self._generate_xss_pattern(payload_value)
-        
-        elif payload_type == "command_injection":
-            pattern, rule_type = self._generate_command_pattern(payload_value)
-        
-        elif payload_type == "path_traversal":
-            pattern, rule_type = self._generate_path_traversal_pattern(payload_value)
-        
-        else:
-            # Generic string match
-            pattern = re.escape(payload_value)
-            rule_type = "string"
+        # Generate pattern based on payload type (memoized per payload)
+        pattern, rule_type = self._generate_pattern(payload_type, payload_value)
         
         # Calculate confidence
         confidence = self._calculate_confidence(sim_result, profile, payload)
@@ -100,7 +86,32 @@ class RuleGenerator:
         
         return rule
     
-    def _generate_sql_pattern(self, payload: str) -> tuple[str, str]:
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _generate_pattern(payload_type: str, payload_value: str) -> tuple[str, str]:
+        """
+        Build the (pattern, rule_type) pair for a payload
+        
+        Pure function of its inputs, so campaigns replaying near-identical
+        payloads hit the cache instead of re-running the pattern builders.
+        """
+        if payload_type == "sql_injection":
+            return RuleGenerator._generate_sql_pattern(payload_value)
+        
+        elif payload_type == "xss":
+            return RuleGenerator._generate_xss_pattern(payload_value)
+        
+        elif payload_type == "command_injection":
+            return RuleGenerator._generate_command_pattern(payload_value)
+        
+        elif payload_type == "path_traversal":
+            return RuleGenerator._generate_path_traversal_pattern(payload_value)
+        
+        # Generic string match
+        return re.escape(payload_value), "string"
+    
+    @staticmethod
+    def _generate_sql_pattern(payload: str) -> tuple[str, str]:
         """Generate regex pattern for SQL injection"""
         # Generalize the pattern to catch variations
         
@@ -127,7 +138,8 @@ class RuleGenerator:
         
         return pattern, "regex"
     
-    def _generate_xss_pattern(self, payload: str) -> tuple[str, str]:
+    @staticmethod
+    def _generate_xss_pattern(payload: str) -> tuple[str, str]:
         """Generate regex pattern for XSS"""
         payload_lower = payload.lower()
         
@@ -150,7 +162,8 @@ class RuleGenerator:
         
         return pattern, "regex"
     
-    def _generate_command_pattern(self, payload: str) -> tuple[str, str]:
+    @staticmethod
+    def _generate_command_pattern(payload: str) -> tuple[str, str]:
         """Generate regex pattern for command injection"""
         # Check for command separators
         if any(sep in payload for sep in [";", "&&", "||", "|"]):
@@ -166,7 +179,8 @@ class RuleGenerator:
         
         return pattern, "regex"
     
-    def _generate_path_traversal_pattern(self, payload: str) -> tuple[str, str]:
+    @staticmethod
+    def _generate_path_traversal_pattern(payload: str) -> tuple[str, str]:
         """Generate regex pattern for path traversal"""
         # Detect directory traversal patterns
         if "../" in payload or "..\\" in payload:
@@ -295,7 +309,11 @@ class RuleGenerator:
                 additional_patterns.append(re.escape(payload))
         
         if additional_patterns:
-            combined_pattern = f"({original_pattern}|{'|'.join(additional_patterns)})"
+            # Dedupe and put longer literals first so the alternation commits
+            # early rather than backtracking through shared prefixes; a
+            # non-capturing group avoids group bookkeeping on every match
+            literals = sorted(dict.fromkeys(additional_patterns), key=len, reverse=True)
+            combined_pattern = f"(?:{original_pattern}|{'|'.join(literals)})"
             rule.match.pattern = combined_pattern
             rule.evidence.sample_payloads.extend(similar_payloads[:5])
         
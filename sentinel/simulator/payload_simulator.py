@@ -1,23 +1,212 @@
 """
 Payload Simulator - Executes attack payloads in isolated sandboxes
 """
+import asyncio
+import atexit
+import random
 import docker
-import tempfile
+import requests
 import os
-import json
+import queue
+import threading
 import time
-from typing import Dict, Optional
+import uuid
+from typing import Callable, Dict, List, Optional
 from datetime import datetime
-import re
+
+
+# Restores the seed database baked into the shadow app image (a plain file
+# copy; no interpreter start-up or SQL per reset)
+_RESET_DB_COMMAND = ["cp", "/app/seed.db", "/tmp/test.db"]
+
+# Shadow app endpoint and request limits
+SHADOW_APP_PORT = 5000
+PAYLOAD_TIMEOUT_SECONDS = 10.0
+MAX_PAYLOAD_LENGTH = 64 * 1024
+
+# Container log tail kept as evidence per payload
+EVIDENCE_LOG_TAIL_LINES = 20
+EVIDENCE_LOG_MAX_BYTES = 500
+HTTP_POOL_SIZE = 64
+
+# Container the simulator runs in (e.g. cerberus-sentinel); it is attached to
+# each sandbox network so it can reach the shadow app. Unset when running on
+# the Docker host itself, where bridge networks are directly routable.
+SIMULATOR_HOST_CONTAINER = os.getenv("SIMULATOR_HOST_CONTAINER")
+
+# Host path of a shadow app source to mount instead of the copy baked into the
+# image (lets the app change without rebuilding cerberus-shadow-app)
+SHADOW_APP_SOURCE = os.getenv("SHADOW_APP_SOURCE")
+
+# Exploit indicators checked by _analyze_result (matched case-insensitively)
+_SQLI_STDOUT_NEEDLES = ("admin@example.com", "user@example.com")
+_SQLI_STDERR_NEEDLES = ("syntax error", "sqlite")
+_SQLI_PAYLOAD_MARKERS = ("OR", "UNION")
+
+# Connections kept open to the Docker daemon; sized for concurrent simulations
+DOCKER_MAX_POOL_SIZE = int(os.getenv("SIMULATOR_DOCKER_POOL_SIZE", "32"))
+
+_docker_client: Optional[docker.DockerClient] = None
+_docker_client_lock = threading.Lock()
+
+
+def get_docker_client() -> docker.DockerClient:
+    """Get the process-wide Docker client (one connection pool for all simulators)"""
+    global _docker_client
+    if _docker_client is None:
+        with _docker_client_lock:
+            if _docker_client is None:
+                _docker_client = docker.from_env(max_pool_size=DOCKER_MAX_POOL_SIZE)
+                atexit.register(_docker_client.close)
+    return _docker_client
+
+
+class SandboxPool:
+    """
+    Keeps pre-provisioned sandboxes warm so simulations skip cold start
+    
+    A background thread tops the pool up to ``min_warm`` ready sandboxes
+    and recycles any older than ``max_age_seconds``. When the pool is empty
+    ``acquire`` provisions on the caller's thread instead of waiting.
+    After consecutive provisioning failures the thread backs off
+    exponentially, up to ``max_backoff_seconds`` between attempts.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], Dict],
+        destroyer: Callable[[Dict], None],
+        min_warm: int = 2,
+        max_idle: int = 8,
+        max_age_seconds: float = 240.0,
+        refill_interval: float = 1.0,
+        max_backoff_seconds: float = 60.0
+    ):
+        self._factory = factory
+        self._destroyer = destroyer
+        self.min_warm = min_warm
+        self.max_idle = max_idle
+        self.max_age_seconds = max_age_seconds
+        self.refill_interval = refill_interval
+        self.max_backoff_seconds = max_backoff_seconds
+        
+        self._ready: "queue.Queue[Dict]" = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the background refill thread (idempotent)"""
+        with self._lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(
+                    target=self._maintain, name="sandbox-pool", daemon=True
+                )
+                self._thread.start()
+    
+    def acquire(self) -> Dict:
+        """Lease a ready sandbox, provisioning one if none is warm"""
+        self.start()
+        
+        while True:
+            try:
+                sandbox = self._ready.get_nowait()
+            except queue.Empty:
+                return self._create()
+            
+            if self._expired(sandbox):
+                self._destroyer(sandbox)
+                continue
+            
+            return sandbox
+    
+    def release(self, sandbox: Dict):
+        """Return a clean sandbox to the pool"""
+        if self._stop.is_set() or self._expired(sandbox) or self._ready.qsize() >= self.max_idle:
+            self._destroyer(sandbox)
+            return
+        
+        sandbox["last_used"] = time.monotonic()
+        self._ready.put(sandbox)
+    
+    def discard(self, sandbox: Dict):
+        """Destroy a sandbox that may be in a bad state"""
+        self._destroyer(sandbox)
+    
+    def close(self):
+        """Stop refilling and destroy all idle sandboxes"""
+        self._stop.set()
+        
+        if self._thread is not None:
+            self._thread.join(timeout=self.refill_interval * 2)
+        
+        while True:
+            try:
+                self._destroyer(self._ready.get_nowait())
+            except queue.Empty:
+                break
+    
+    def size(self) -> int:
+        """Number of idle, ready sandboxes"""
+        return self._ready.qsize()
+    
+    def _create(self) -> Dict:
+        sandbox = self._factory()
+        sandbox["created_at"] = time.monotonic()
+        return sandbox
+    
+    def _expired(self, sandbox: Dict) -> bool:
+        return time.monotonic() - sandbox.get("created_at", 0.0) > self.max_age_seconds
+    
+    def _maintain(self):
+        failures = 0
+        
+        while not self._stop.is_set():
+            # Recycle sandboxes that are close to their keep-alive limit
+            for _ in range(self._ready.qsize()):
+                try:
+                    sandbox = self._ready.get_nowait()
+                except queue.Empty:
+                    break
+                if self._expired(sandbox):
+                    self._destroyer(sandbox)
+                else:
+                    self._ready.put(sandbox)
+            
+            while not self._stop.is_set() and self._ready.qsize() < self.min_warm:
+                try:
+                    self._ready.put(self._create())
+                    failures = 0
+                except Exception as e:
+                    failures += 1
+                    print(f"[SIMULATOR] Error warming sandbox: {e}")
+                    break
+            
+            delay = self.refill_interval
+            if failures:
+                delay = min(self.refill_interval * 2 ** failures, self.max_backoff_seconds)
+            self._stop.wait(delay)
 
 
 class PayloadSimulator:
     """Simulate attack payloads against shadow application"""
     
-    def __init__(self, docker_client=None):
-        self.docker_client = docker_client or docker.from_env()
+    def __init__(self, docker_client=None, min_warm: int = 2):
+        self.docker_client = docker_client or get_docker_client()
         self.timeout_seconds = 300  # 5 minutes max
         self.shadow_app_image = "cerberus-shadow-app:latest"
+        self.min_warm = min_warm
+        
+        # One warm pool per shadow app ref
+        self._pools: Dict[str, SandboxPool] = {}
+        self._pools_lock = threading.Lock()
+        
+        # Keep-alive HTTP client for talking to shadow apps directly
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+        )
+        self._http.mount("http://", adapter)
     
     def simulate(self, payload: Dict, shadow_app_ref: str = "main") -> Dict:
         """
@@ -32,66 +221,214 @@ class PayloadSimulator:
         """
         print(f"[SIMULATOR] Starting simulation for {payload.get('type')} payload")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
-            # Provision sandbox
-            sandbox = self._provision_sandbox()
-            
-            # Deploy shadow app
-            self._deploy_shadow_app(sandbox, shadow_app_ref)
-            
-            # Inject test data
-            self._seed_database(sandbox)
-            
-            # Execute payload
-            result = self._execute_payload(sandbox, payload)
-            
-            # Analyze result
-            verdict = self._analyze_result(result, payload)
-            
-            # Calculate severity
-            severity = self._calculate_severity(verdict, payload)
-            
-            # Collect evidence
-            evidence = self._collect_evidence(sandbox, result)
-            
-            # Generate reproduction steps
-            repro_steps = self._generate_repro_steps(payload, shadow_app_ref)
+            return self._run_simulation(payload, shadow_app_ref, start_time)
+        
+        except Exception as e:
+            print(f"[SIMULATOR] Error: {e}")
+            return self._error_result(e, start_time)
+    
+    async def simulate_async(self, payload: Dict, shadow_app_ref: str = "main") -> Dict:
+        """Run ``simulate`` on a worker thread without blocking the event loop"""
+        return await asyncio.to_thread(self.simulate, payload, shadow_app_ref)
+    
+    def simulate_campaign(
+        self,
+        payloads: List[Dict],
+        shadow_app_ref: str = "main",
+        isolate: bool = True
+    ) -> List[Dict]:
+        """
+        Run a campaign of payload variants sequentially through one sandbox
+        
+        Amortizes the sandbox lease over the whole campaign. Each payload gets
+        its own result, so a failure is attributed to the payload that caused it.
+        
+        Args:
+            payloads: Payload dicts with type, value, location
+            shadow_app_ref: Git reference for shadow app (commit/branch)
+            isolate: Reset the database between payloads
             
-            execution_time = int((time.time() - start_time) * 1000)
+        Returns:
+            One simulation result dict per payload, in order
+        """
+        print(f"[SIMULATOR] Starting campaign of {len(payloads)} payloads")
+        
+        pool = self._get_pool(shadow_app_ref)
+        results = []
+        sandbox = None
+        reusable = True
+        
+        try:
+            sandbox = pool.acquire()
             
-            return {
-                "verdict": verdict,
-                "severity": severity,
-                "execution_time_ms": execution_time,
-                "evidence": evidence,
-                "reproduction_steps": repro_steps,
-                "attack_type": payload.get("type"),
-                "payload": payload,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            for index, payload in enumerate(payloads):
+                start_time = time.monotonic()
+                
+                # Malformed payloads never touch the sandbox, so it stays reusable
+                try:
+                    self._validate_payload(payload)
+                except ValueError as e:
+                    results.append(self._error_result(e, start_time))
+                    continue
+                
+                try:
+                    if index and isolate and not self._reset_sandbox(sandbox):
+                        raise RuntimeError("Failed to reset sandbox between payloads")
+                    
+                    results.append(
+                        self._evaluate_payload(sandbox, payload, shadow_app_ref, start_time)
+                    )
+                
+                except Exception as e:
+                    print(f"[SIMULATOR] Error on campaign payload {index}: {e}")
+                    results.append(self._error_result(e, start_time))
+                    reusable = False
         
         except Exception as e:
+            # Could not lease a sandbox: every remaining payload fails
             print(f"[SIMULATOR] Error: {e}")
-            return {
-                "verdict": "error",
-                "severity": 0.0,
-                "error": str(e),
-                "execution_time_ms": int((time.time() - start_time) * 1000)
-            }
+            start_time = time.monotonic()
+            results.extend(self._error_result(e, start_time) for _ in payloads[len(results):])
+            reusable = False
         
         finally:
-            # Always cleanup sandbox
-            if 'sandbox' in locals():
-                self._destroy_sandbox(sandbox)
+            if sandbox is not None:
+                if reusable and self._reset_sandbox(sandbox):
+                    pool.release(sandbox)
+                else:
+                    pool.discard(sandbox)
+        
+        return results
+    
+    def _run_simulation(self, payload: Dict, shadow_app_ref: str, start_time: float) -> Dict:
+        """Lease a sandbox and run one payload through it; raises on failure"""
+        self._validate_payload(payload)
+        
+        pool = self._get_pool(shadow_app_ref)
+        sandbox = None
+        reusable = False
+        
+        try:
+            # Lease a warm sandbox (shadow app already deployed and seeded)
+            sandbox = pool.acquire()
+            
+            result = self._evaluate_payload(sandbox, payload, shadow_app_ref, start_time)
+            reusable = True
+            
+            return result
+        
+        finally:
+            # Return the sandbox only if it can be reset to a clean state
+            if sandbox is not None:
+                if reusable and self._reset_sandbox(sandbox):
+                    pool.release(sandbox)
+                else:
+                    pool.discard(sandbox)
+    
+    def _evaluate_payload(
+        self,
+        sandbox: Dict,
+        payload: Dict,
+        shadow_app_ref: str,
+        start_time: float
+    ) -> Dict:
+        """Execute one payload in a leased sandbox and build its result"""
+        # Wall-clock mark for scoping container logs (start_time is monotonic)
+        since = time.time()
+        
+        # Execute payload
+        result = self._execute_payload(sandbox, payload)
+        
+        # Analyze result
+        verdict = self._analyze_result(result, payload)
+        
+        # Calculate severity
+        severity = self._calculate_severity(verdict, payload)
+        
+        # Collect evidence (only logs written during this payload)
+        evidence = self._collect_evidence(sandbox, result, since=since)
+        
+        # Generate reproduction steps
+        repro_steps = self._generate_repro_steps(payload, shadow_app_ref)
+        
+        execution_time = int((time.monotonic() - start_time) * 1000)
+        
+        return {
+            "verdict": verdict,
+            "severity": severity,
+            "execution_time_ms": execution_time,
+            "evidence": evidence,
+            "reproduction_steps": repro_steps,
+            "attack_type": payload.get("type"),
+            "payload": payload,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    @staticmethod
+    def _error_result(error: Exception, start_time: float) -> Dict:
+        """Build the result dict reported for a failed simulation"""
+        return {
+            "verdict": "error",
+            "severity": 0.0,
+            "error": str(error),
+            "execution_time_ms": int((time.monotonic() - start_time) * 1000)
+        }
+    
+    def close(self):
+        """Destroy all pooled sandboxes"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        
+        for pool in pools:
+            pool.close()
+        
+        self._http.close()
+    
+    def _get_pool(self, shadow_app_ref: str) -> SandboxPool:
+        """Get (or lazily create) the warm pool for a shadow app ref"""
+        with self._pools_lock:
+            pool = self._pools.get(shadow_app_ref)
+            if pool is None:
+                pool = SandboxPool(
+                    factory=lambda: self._prepare_sandbox(shadow_app_ref),
+                    destroyer=self._destroy_sandbox,
+                    min_warm=self.min_warm
+                )
+                self._pools[shadow_app_ref] = pool
+            return pool
+    
+    def _prepare_sandbox(self, ref: str) -> Dict:
+        """Provision a sandbox with the shadow app deployed and seeded"""
+        sandbox = self._provision_sandbox()
+        
+        try:
+            self._deploy_shadow_app(sandbox, ref)
+            self._seed_database(sandbox)
+        except Exception:
+            self._destroy_sandbox(sandbox)
+            raise
+        
+        return sandbox
+    
+    def _reset_sandbox(self, sandbox: Dict) -> bool:
+        """Restore seed data so the next lease starts from a clean database"""
+        try:
+            exec_result = sandbox["container"].exec_run(_RESET_DB_COMMAND)
+            return exec_result.exit_code == 0
+        except Exception as e:
+            print(f"[SIMULATOR] Error resetting sandbox {sandbox['id']}: {e}")
+            return False
     
     def _provision_sandbox(self) -> Dict:
         """Create isolated sandbox container"""
         print("[SIMULATOR] Provisioning sandbox...")
         
         # Create isolated network
-        network_name = f"sandbox_{int(time.time())}"
+        network_name = f"sandbox_{uuid.uuid4().hex[:12]}"
         network = self.docker_client.networks.create(
             network_name,
             driver="bridge",
@@ -99,116 +436,138 @@ class PayloadSimulator:
             labels={"cerberus": "sandbox"}
         )
         
-        # Start shadow app container
-        container = self.docker_client.containers.run(
-            "python:3.11-slim",  # Base image (in production: use custom shadow app image)
-            command="sleep 300",  # Keep alive for 5 minutes
-            detach=True,
-            network=network_name,
-            mem_limit="512m",
-            cpu_period=100000,
-            cpu_quota=50000,  # 0.5 CPU
-            security_opt=["no-new-privileges"],
-            cap_drop=["ALL"],
-            read_only=False,  # Need write for app
-            tmpfs={'/tmp': 'size=100M'},
-            labels={"cerberus": "sandbox"}
-        )
-        
-        # Wait for container to be ready
-        time.sleep(2)
+        container = None
+        host_attached = False
+        try:
+            # Optionally bind-mount app source over the baked-in copy (read-only)
+            mounts = []
+            if SHADOW_APP_SOURCE:
+                mounts.append(docker.types.Mount(
+                    target="/app/app.py",
+                    source=SHADOW_APP_SOURCE,
+                    type="bind",
+                    read_only=True
+                ))
+            
+            # Start shadow app container
+            # The image runs the shadow app as its entrypoint (Flask preinstalled)
+            container = self.docker_client.containers.run(
+                self.shadow_app_image,
+                detach=True,
+                network=network_name,
+                mounts=mounts,
+                mem_limit="512m",
+                cpu_period=100000,
+                cpu_quota=50000,  # 0.5 CPU
+                security_opt=["no-new-privileges"],
+                cap_drop=["ALL"],
+                read_only=False,  # Need write for app
+                tmpfs={'/tmp': 'size=100M'},
+                labels={"cerberus": "sandbox"}
+            )
+            
+            # Let the simulator reach the shadow app over the internal network
+            if SIMULATOR_HOST_CONTAINER:
+                network.connect(SIMULATOR_HOST_CONTAINER)
+                host_attached = True
+            
+            # Wait for container to be running with an address on the sandbox network
+            ip_address = self._wait_for_container_ip(container, network_name)
+        except Exception:
+            # Don't leak the network (and container) when a later step fails
+            if container is not None:
+                try:
+                    container.remove(force=True)
+                except Exception as e:
+                    print(f"[SIMULATOR] Error removing failed sandbox container: {e}")
+            try:
+                if host_attached:
+                    network.disconnect(SIMULATOR_HOST_CONTAINER, force=True)
+                network.remove()
+            except Exception as e:
+                print(f"[SIMULATOR] Error removing failed sandbox network: {e}")
+            raise
         
         print(f"[SIMULATOR] Sandbox provisioned: {container.id[:12]}")
         
         return {
             "container": container,
             "network": network,
-            "id": container.id[:12]
+            "id": container.id[:12],
+            "base_url": f"http://{ip_address}:{SHADOW_APP_PORT}",
+            "host_attached": host_attached
         }
     
-    def _deploy_shadow_app(self, sandbox: Dict, ref: str):
-        """Deploy shadow application in sandbox"""
-        container = sandbox["container"]
-        
-        # In production: clone shadow app repo and deploy
-        # For demo: create a simple vulnerable Flask app
-        
-        app_code = '''
-from flask import Flask, request
-import sqlite3
-
-app = Flask(__name__)
-
-# Initialize database
-conn = sqlite3.connect('/tmp/test.db')
-c = conn.cursor()
-c.execute("CREATE TABLE users (id INTEGER, name TEXT, email TEXT)")
-c.execute("INSERT INTO users VALUES (1, 'Admin', 'admin@example.com')")
-c.execute("INSERT INTO users VALUES (2, 'User', 'user@example.com')")
-conn.commit()
-conn.close()
-
-@app.route('/api/v1/users')
-def get_users():
-    user_id = request.args.get('id', '')
-    
-    # Vulnerable to SQL injection
-    conn = sqlite3.connect('/tmp/test.db')
-    c = conn.cursor()
-    
-    if user_id:
-        query = f"SELECT * FROM users WHERE id = {user_id}"  # VULNERABLE!
-    else:
-        query = "SELECT * FROM users"
-    
-    try:
-        c.execute(query)
-        results = c.fetchall()
-        conn.close()
-        return {"users": [{"id": r[0], "name": r[1], "email": r[2]} for r in results]}
-    except Exception as e:
-        conn.close()
-        return {"error": str(e)}, 500
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
-'''
-        
-        # Copy app to container
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(app_code)
-            app_file = f.name
-        
-        try:
-            # Install Flask
-            container.exec_run("pip install flask", detach=False)
+    def _wait_for_container_ip(
+        self,
+        container,
+        network_name: str,
+        timeout: float = 10.0,
+        interval: float = 0.05
+    ) -> str:
+        """Poll until the container is running and return its sandbox IP"""
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            container.reload()
+            if container.status == "running":
+                networks = container.attrs["NetworkSettings"]["Networks"]
+                ip_address = networks.get(network_name, {}).get("IPAddress")
+                if ip_address:
+                    return ip_address
+            elif container.status in ("exited", "dead"):
+                raise RuntimeError(f"Sandbox container {container.id[:12]} {container.status}")
             
-            # Copy app file
-            with open(app_file, 'rb') as f:
-                container.put_archive('/tmp', [(os.path.basename(app_file), f.read())])
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Sandbox container not running after {timeout:.0f}s")
             
-            # Start app in background
-            container.exec_run(
-                f"python /tmp/{os.path.basename(app_file)}",
-                detach=True
-            )
+            time.sleep(interval)
+    
+    def _deploy_shadow_app(self, sandbox: Dict, ref: str, timeout: float = 10.0):
+        """
+        Wait for the shadow app baked into the sandbox image to come up
+        
+        In production the image would be built per ref; for the demo every
+        ref uses cerberus-shadow-app:latest.
+        """
+        health_url = f"{sandbox['base_url']}/healthz"
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            try:
+                if self._http.get(health_url, timeout=1.0).ok:
+                    break
+            except requests.exceptions.RequestException:
+                pass
             
-            # Wait for app to start
-            time.sleep(3)
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Shadow app not ready after {timeout:.0f}s")
             
-            print("[SIMULATOR] Shadow app deployed")
+            time.sleep(0.05)
         
-        finally:
-            os.unlink(app_file)
+        print("[SIMULATOR] Shadow app deployed")
     
     def _seed_database(self, sandbox: Dict):
         """Inject synthetic test data"""
-        # Data is created in _deploy_shadow_app for this demo
+        # The shadow app seeds its database on startup
         print("[SIMULATOR] Database seeded with test data")
     
+    @staticmethod
+    def _validate_payload(payload: Dict):
+        """Reject payloads that cannot be sent as a single request parameter"""
+        payload_type = payload.get("type", "unknown")
+        payload_value = payload.get("value", "")
+        
+        if not isinstance(payload_type, str):
+            raise ValueError(f"Payload type must be a string, got {type(payload_type).__name__}")
+        if not isinstance(payload_value, str):
+            raise ValueError(f"Payload value must be a string, got {type(payload_value).__name__}")
+        if len(payload_value) > MAX_PAYLOAD_LENGTH:
+            raise ValueError(f"Payload value exceeds {MAX_PAYLOAD_LENGTH} characters")
+    
     def _execute_payload(self, sandbox: Dict, payload: Dict) -> Dict:
         """Execute the attack payload"""
-        container = sandbox["container"]
+        base_url = sandbox["base_url"]
         payload_type = payload.get("type", "unknown")
         payload_value = payload.get("value", "")
         
@@ -216,30 +575,38 @@ if __name__ == '__main__':
         
         if payload_type == "sql_injection":
             # Test SQL injection
-            cmd = f"curl -s 'http://localhost:5000/api/v1/users?id={payload_value}'"
+            request = ("GET", f"{base_url}/api/v1/users", {"params": {"id": payload_value}})
         
         elif payload_type == "xss":
             # Test XSS (not applicable for API, but log it)
-            cmd = f"curl -s 'http://localhost:5000/api/v1/users?name={payload_value}'"
+            request = ("GET", f"{base_url}/api/v1/users", {"params": {"name": payload_value}})
         
         elif payload_type == "command_injection":
             # Test command injection
-            cmd = f"curl -s -d 'cmd={payload_value}' http://localhost:5000/api/exec"
+            request = ("POST", f"{base_url}/api/exec", {"data": {"cmd": payload_value}})
         
         else:
             # Generic test
-            cmd = "curl -s http://localhost:5000/api/v1/users"
+            request = ("GET", f"{base_url}/api/v1/users", {})
         
-        # Execute in container
-        exec_result = container.exec_run(cmd, demux=True)
+        method, url, kwargs = request
         
-        stdout = exec_result.output[0].decode() if exec_result.output[0] else ""
-        stderr = exec_result.output[1].decode() if exec_result.output[1] else ""
+        # Values are URL/form-encoded by the client, never interpolated into a shell
+        try:
+            response = self._http.request(method, url, timeout=PAYLOAD_TIMEOUT_SECONDS, **kwargs)
+        except requests.exceptions.RequestException as e:
+            return {
+                "exit_code": 1,
+                "stdout": "",
+                "stderr": str(e),
+                "payload_type": payload_type
+            }
         
         return {
-            "exit_code": exec_result.exit_code,
-            "stdout": stdout,
-            "stderr": stderr,
+            "exit_code": 0,
+            "status_code": response.status_code,
+            "stdout": response.text,
+            "stderr": "",
             "payload_type": payload_type
         }
     
@@ -257,13 +624,16 @@ if __name__ == '__main__':
         # SQL Injection detection
         if payload_type == "sql_injection":
             # Check if query returned unexpected data
-            if "admin@example.com" in stdout.lower() or "user@example.com" in stdout.lower():
+            stdout_lc = stdout.lower()
+            if any(needle in stdout_lc for needle in _SQLI_STDOUT_NEEDLES):
                 # Data was extracted
-                if "OR" in payload.get("value", "").upper() or "UNION" in payload.get("value", "").upper():
+                value_uc = payload.get("value", "").upper()
+                if any(marker in value_uc for marker in _SQLI_PAYLOAD_MARKERS):
                     return "exploit_possible"
             
             # Check for SQL errors (indicates injection attempt worked)
-            if "syntax error" in stderr.lower() or "sqlite" in stderr.lower():
+            stderr_lc = stderr.lower()
+            if any(needle in stderr_lc for needle in _SQLI_STDERR_NEEDLES):
                 return "exploit_possible"
         
         # XSS detection
@@ -310,12 +680,14 @@ if __name__ == '__main__':
         
         return min(10.0, adjusted_score)
     
-    def _collect_evidence(self, sandbox: Dict, result: Dict) -> Dict:
+    def _collect_evidence(self, sandbox: Dict, result: Dict, since: Optional[float] = None) -> Dict:
         """Collect evidence from sandbox"""
         container = sandbox["container"]
         
-        # Get logs
-        logs = container.logs(tail=50).decode()
+        # Get logs; a leased sandbox also holds output from earlier payloads,
+        # so scope to this run and keep only the tail that is reported
+        raw_logs = container.logs(stdout=True, stderr=True, since=since, tail=EVIDENCE_LOG_TAIL_LINES)
+        logs = raw_logs[-EVIDENCE_LOG_MAX_BYTES:].decode("utf-8", "replace")
         
         # Get filesystem changes (if any)
         # In production: diff filesystem, check for backdoors
@@ -323,7 +695,7 @@ if __name__ == '__main__':
         evidence = {
             "container_id": sandbox["id"],
             "execution_result": result,
-            "container_logs": logs[-500:],  # Last 500 chars
+            "container_logs": logs,
             "exploitation_confirmed": result.get("verdict") == "exploit_possible"
         }
         
@@ -354,10 +726,135 @@ if __name__ == '__main__':
             container.stop(timeout=5)
             container.remove(force=True)
             
-            # Remove network
+            # Remove network (detach the simulator first, or removal fails)
+            if sandbox.get("host_attached"):
+                network.disconnect(SIMULATOR_HOST_CONTAINER, force=True)
             network.remove()
             
             print(f"[SIMULATOR] Sandbox {sandbox['id']} destroyed")
         
         except Exception as e:
             print(f"[SIMULATOR] Error destroying sandbox: {e}")
+
+
+# Docker/HTTP failures worth retrying; anything else is reported immediately
+_TRANSIENT_ERRORS = (docker.errors.APIError, requests.exceptions.ConnectionError)
+
+
+class BatchPayloadSimulator:
+    """
+    Run many payload simulations concurrently against one PayloadSimulator
+    
+    Simulations are I/O-bound on the Docker daemon, so a bounded number run
+    on worker threads at once; a semaphore keeps daemon load predictable.
+    """
+    
+    def __init__(
+        self,
+        simulator: PayloadSimulator,
+        max_concurrency: int = 10,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5
+    ):
+        self.simulator = simulator
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        
+        self._in_flight: set = set()
+        self._closing = False
+    
+    async def process_batch(
+        self,
+        payloads: List[Dict],
+        shadow_app_ref: str = "main",
+        on_progress: Optional[Callable[[int, int, Dict], None]] = None
+    ) -> Dict:
+        """
+        Simulate a batch of payloads concurrently
+        
+        Args:
+            payloads: Payload dicts as accepted by ``PayloadSimulator.simulate``
+            shadow_app_ref: Git reference for shadow app (commit/branch)
+            on_progress: Optional callback ``(completed, total, result)``
+            
+        Returns:
+            Dict with per-payload ``results`` (input order) and latency ``stats``
+        """
+        if self._closing:
+            raise RuntimeError("BatchPayloadSimulator is shutting down")
+        
+        start_time = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: List[Optional[Dict]] = [None] * len(payloads)
+        
+        async def bounded(index: int, payload: Dict):
+            async with semaphore:
+                return index, await self._simulate_with_retry(payload, shadow_app_ref)
+        
+        tasks = [asyncio.create_task(bounded(i, p)) for i, p in enumerate(payloads)]
+        self._in_flight.update(tasks)
+        
+        try:
+            completed = 0
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                results[index] = result
+                completed += 1
+                if on_progress:
+                    on_progress(completed, len(payloads), result)
+        finally:
+            self._in_flight.difference_update(tasks)
+        
+        return {
+            "results": results,
+            "stats": self._latency_stats(results, start_time)
+        }
+    
+    async def shutdown(self):
+        """Stop accepting batches and wait for in-flight simulations"""
+        self._closing = True
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+    
+    async def _simulate_with_retry(self, payload: Dict, shadow_app_ref: str) -> Dict:
+        start_time = time.monotonic()
+        attempt = 0
+        
+        while True:
+            try:
+                return await asyncio.to_thread(
+                    self.simulator._run_simulation, payload, shadow_app_ref, start_time
+                )
+            except _TRANSIENT_ERRORS as e:
+                if attempt >= self.max_retries:
+                    print(f"[SIMULATOR] Error after {attempt + 1} attempts: {e}")
+                    return self.simulator._error_result(e, start_time)
+                
+                # Exponential backoff with full jitter
+                delay = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception as e:
+                print(f"[SIMULATOR] Error: {e}")
+                return self.simulator._error_result(e, start_time)
+    
+    @staticmethod
+    def _latency_stats(results: List[Dict], start_time: float) -> Dict:
+        """Summarize batch latency (nearest-rank percentiles)"""
+        latencies = sorted(r["execution_time_ms"] for r in results)
+        
+        def percentile(pct: float) -> int:
+            if not latencies:
+                return 0
+            rank = max(0, int(round(pct / 100.0 * len(latencies))) - 1)
+            return latencies[min(rank, len(latencies) - 1)]
+        
+        return {
+            "count": len(results),
+            "errors": sum(1 for r in results if r["verdict"] == "error"),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "wall_time_ms": int((time.monotonic() - start_time) * 1000)
+        }
@@ -0,0 +1,76 @@
+"""
+Shadow App - Deliberately vulnerable Flask app used as the simulation target
+
+Baked into the cerberus-shadow-app image (infrastructure/docker/Dockerfile.shadow-app)
+so sandboxes start with the app already running.
+"""
+import os
+import shutil
+import sqlite3
+
+from flask import Flask, request
+from werkzeug.serving import WSGIRequestHandler
+
+DB_PATH = '/tmp/test.db'
+
+# Seed database baked into the image at build time
+SEED_DB_PATH = '/app/seed.db'
+
+app = Flask(__name__)
+
+
+def build_db(path: str):
+    """Create a database with seed data at ``path``"""
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute("CREATE TABLE users (id INTEGER, name TEXT, email TEXT)")
+    c.execute("INSERT INTO users VALUES (1, 'Admin', 'admin@example.com')")
+    c.execute("INSERT INTO users VALUES (2, 'User', 'user@example.com')")
+    conn.commit()
+    conn.close()
+
+
+def init_db():
+    """(Re)create the working database, copying the prebuilt seed if present"""
+    if os.path.exists(SEED_DB_PATH):
+        shutil.copyfile(SEED_DB_PATH, DB_PATH)
+        return
+    
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    build_db(DB_PATH)
+
+
+@app.route('/healthz')
+def healthz():
+    return {"status": "ok"}
+
+
+@app.route('/api/v1/users')
+def get_users():
+    user_id = request.args.get('id', '')
+    
+    # Vulnerable to SQL injection
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    
+    if user_id:
+        query = f"SELECT * FROM users WHERE id = {user_id}"  # VULNERABLE!
+    else:
+        query = "SELECT * FROM users"
+    
+    try:
+        c.execute(query)
+        results = c.fetchall()
+        conn.close()
+        return {"users": [{"id": r[0], "name": r[1], "email": r[2]} for r in results]}
+    except Exception as e:
+        conn.close()
+        return {"error": str(e)}, 500
+
+
+if __name__ == '__main__':
+    init_db()
+    # HTTP/1.1 so the simulator's keep-alive connections are reused
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -13,7 +13,7 @@ from fastapi.security import (
 from shared.auth.jwt_handler import (
     decode_token,
     verify_token,
-    TokenData,
+    TokenClaims,
     verify_service_api_key,
     SERVICE_ACCOUNTS
 )
@@ -25,7 +25,7 @@ api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 async def get_current_token(
     credentials: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme)
-) -> TokenData:
+) -> TokenClaims:
     """
     Dependency that extracts JWT token data.
     Raises 401 if token missing or invalid.
@@ -51,7 +51,7 @@ async def get_current_token(
 def require_roles(required_roles: Optional[List[str]] = None):
     """Factory returning dependency that enforces role membership."""
 
-    async def dependency(token: TokenData = Depends(get_current_token)) -> TokenData:
+    async def dependency(token: TokenClaims = Depends(get_current_token)) -> TokenClaims:
         if required_roles:
             if not any(role in token.roles for role in required_roles):
                 raise HTTPException(
@@ -66,7 +66,7 @@ def require_roles(required_roles: Optional[List[str]] = None):
 async def get_current_service(
     credentials: Optional[HTTPAuthorizationCredentials] = Security(bearer_scheme),
     api_key: Optional[str] = Security(api_key_scheme)
-) -> TokenData:
+) -> TokenClaims:
     """
     Dependency accepting either JWT bearer tokens or service API keys.
     Used for service-to-service authentication.
@@ -81,7 +81,7 @@ async def get_current_service(
     if api_key:
         service_info = verify_service_api_key(api_key)
         if service_info:
-            return TokenData(
+            return TokenClaims(
                 username=service_info["username"],
                 service=service_info["service"],
                 roles=service_info["roles"]
@@ -96,8 +96,8 @@ async def get_current_service(
 
 async def require_service(
     service: str,
-    token: TokenData = Depends(get_current_service)
-) -> TokenData:
+    token: TokenClaims = Depends(get_current_service)
+) -> TokenClaims:
     """Ensure the calling service matches the required service name."""
     if token.service != service:
         raise HTTPException(
@@ -109,8 +109,8 @@ async def require_service(
 
 async def require_service_roles(
     roles: List[str],
-    token: TokenData = Depends(get_current_service)
-) -> TokenData:
+    token: TokenClaims = Depends(get_current_service)
+) -> TokenClaims:
     """Ensure service token carries one of the required roles."""
     if not any(role in token.roles for role in roles):
         raise HTTPException(
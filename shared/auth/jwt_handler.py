@@ -2,23 +2,42 @@
 JWT Authentication Handler for Cerberus
 Provides unified authentication across all services
 """
+import hashlib
+import hmac
 import os
-from datetime import datetime, timedelta
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, List
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
+from jwt import DecodeError, PyJWTError
 from pydantic import BaseModel
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration from environment
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "cerberus-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("JWT_CACHE_TTL_SECONDS", "30"))
+TOKEN_CACHE_MAX_SIZE = 10_000
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Password hashing (built on first use; passlib probes backends on import,
+# and only user-password flows need it)
+_pwd_context = None
+_pwd_context_lock = threading.Lock()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# API key hashing (HMAC-SHA256 keyed with the service secret)
+_API_KEY_HMAC_KEY = SECRET_KEY.encode()
 
 
 class TokenData(BaseModel):
@@ -29,6 +48,67 @@ class TokenData(BaseModel):
     exp: Optional[datetime] = None
 
 
+class TokenClaims:
+    """
+    Verified token claims returned by ``decode_token``
+    
+    A plain ``__slots__`` class: claims come from a signature-verified token,
+    so the per-request path skips pydantic model construction. Use
+    ``TokenData`` where a validated/serializable model is needed.
+    """
+    __slots__ = ("username", "service", "roles", "exp")
+    
+    def __init__(
+        self,
+        username: str,
+        service: str,
+        roles: Optional[List[str]] = None,
+        exp: Optional[int] = None
+    ):
+        self.username = username
+        self.service = service
+        self.roles = roles if roles is not None else []
+        self.exp = exp
+    
+    def __repr__(self) -> str:
+        return (
+            f"TokenClaims(username={self.username!r}, service={self.service!r}, "
+            f"roles={self.roles!r}, exp={self.exp!r})"
+        )
+    
+    def to_model(self) -> TokenData:
+        """Convert to the pydantic ``TokenData`` model"""
+        exp = datetime.fromtimestamp(self.exp, tz=timezone.utc) if self.exp is not None else None
+        return TokenData(username=self.username, service=self.service, roles=self.roles, exp=exp)
+
+
+class _OrjsonJWT(jwt.PyJWT):
+    """PyJWT using orjson for claim (de)serialization"""
+    
+    def _encode_payload(self, payload, headers=None, json_encoder=None) -> bytes:
+        if json_encoder is not None:
+            return super()._encode_payload(payload, headers, json_encoder)
+        return orjson.dumps(payload)
+    
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}")
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jwt = _OrjsonJWT() if orjson is not None else jwt.PyJWT()
+
+# Verified tokens: token -> (claim fields, cached_until epoch seconds), LRU order.
+# Fields are kept as an immutable tuple and each hit builds its own TokenClaims,
+# so a caller mutating ``roles`` cannot affect later requests.
+_token_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
 class User(BaseModel):
     """User model"""
     username: str
@@ -38,6 +118,26 @@ class User(BaseModel):
     api_key_hash: Optional[str] = None
 
 
+def _get_pwd_context():
+    """Return the shared bcrypt CryptContext, creating it on first call"""
+    global _pwd_context
+    if _pwd_context is None:
+        with _pwd_context_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+                context = CryptContext(
+                    schemes=["bcrypt"],
+                    deprecated="auto",
+                    bcrypt__rounds=BCRYPT_ROUNDS,
+                    bcrypt__ident="2b"
+                )
+                # Resolve the bcrypt backend now so the probe is not paid
+                # inside the first hash/verify call
+                context.handler("bcrypt").get_backend()
+                _pwd_context = context
+    return _pwd_context
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify password against hash
@@ -49,7 +149,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -62,7 +162,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         Bcrypt hash
     """
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 
 def create_access_token(
@@ -81,18 +181,19 @@ def create_access_token(
     """
     to_encode = data.copy()
     
+    # NumericDate per RFC 7519; no datetime round trip
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = int(time.time() + expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[TokenData]:
+def decode_token(token: str) -> Optional[TokenClaims]:
     """
     Decode and validate JWT token
     
@@ -100,24 +201,60 @@ def decode_token(token: str) -> Optional[TokenData]:
         token: JWT token string
         
     Returns:
-        TokenData if valid, None otherwise
+        TokenClaims if valid, None otherwise
     """
+    now = time.time()
+    
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            fields, cached_until = cached
+            if now < cached_until:
+                _token_cache.move_to_end(token)
+                username, service, roles, exp = fields
+                return TokenClaims(username, service, list(roles), exp)
+            del _token_cache[token]
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("username")
         service: str = payload.get("service")
         roles: List[str] = payload.get("roles", [])
         
-        if username is None:
+        # TokenData requires a service; reject such tokens rather than
+        # raising from the model or issuing claims with no service
+        if username is None or service is None:
             return None
         
-        return TokenData(username=username, service=service, roles=roles)
+        exp = payload.get("exp")
+        _cache_token(token, (username, service, tuple(roles), exp), exp, now)
+        
+        return TokenClaims(username, service, roles, exp)
     
-    except JWTError as e:
+    except PyJWTError as e:
         logger.warning(f"JWT decode error: {e}")
         return None
 
 
+def _cache_token(token: str, fields: tuple, exp: Optional[int], now: float):
+    """Remember a verified token's claims until the cache TTL or its own expiry"""
+    cached_until = now + TOKEN_CACHE_TTL_SECONDS
+    if exp is not None:
+        cached_until = min(cached_until, float(exp))
+    
+    with _token_cache_lock:
+        _token_cache[token] = (fields, cached_until)
+        _token_cache.move_to_end(token)
+        while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+
+def clear_token_cache():
+    """Drop all cached token verifications (e.g. after rotating SECRET_KEY)"""
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
 def verify_token(token: str, required_service: Optional[str] = None, required_roles: Optional[List[str]] = None) -> bool:
     """
     Verify token and check service/role requirements
@@ -159,8 +296,6 @@ def create_api_key(username: str, service: str) -> str:
     Returns:
         API key string
     """
-    import secrets
-    
     # API key format: cerberus_<service>_<random_32_chars>
     random_part = secrets.token_urlsafe(24)
     api_key = f"cerberus_{service}_{random_part}"
@@ -172,13 +307,16 @@ def hash_api_key(api_key: str) -> str:
     """
     Hash API key for storage
     
+    API keys are high-entropy random strings, so a keyed HMAC-SHA256 is
+    sufficient; bcrypt's deliberate slowness is reserved for passwords.
+    
     Args:
         api_key: API key to hash
         
     Returns:
-        Hashed API key
+        Hex-encoded HMAC-SHA256 of the API key
     """
-    return get_password_hash(api_key)
+    return hmac.new(_API_KEY_HMAC_KEY, api_key.encode(), hashlib.sha256).hexdigest()
 
 
 def verify_api_key(api_key: str, hashed_key: str) -> bool:
@@ -187,12 +325,16 @@ def verify_api_key(api_key: str, hashed_key: str) -> bool:
     
     Args:
         api_key: API key to verify
-        hashed_key: Stored hash
+        hashed_key: Stored hash (HMAC-SHA256 hex, or a legacy bcrypt hash)
         
     Returns:
         True if API key matches
     """
-    return verify_password(api_key, hashed_key)
+    if hashed_key.startswith("$2"):
+        # Keys hashed before the switch to HMAC
+        return verify_password(api_key, hashed_key)
+    
+    return hmac.compare_digest(hash_api_key(api_key), hashed_key)
 
 
 # Predefined service accounts for internal communication
@@ -230,6 +372,13 @@ SERVICE_ACCOUNTS = {
 }
 
 
+# Reverse index: HMAC of each service API key -> account
+_SERVICE_ACCOUNTS_BY_KEY_HASH = {
+    hash_api_key(account["api_key"]): account
+    for account in SERVICE_ACCOUNTS.values()
+}
+
+
 def get_service_token(service_name: str) -> Optional[str]:
     """
     Get JWT token for service account
@@ -266,8 +415,5 @@ def verify_service_api_key(api_key: str) -> Optional[Dict[str, any]]:
     Returns:
         Service account dict if valid, None otherwise
     """
-    for service_name, service_account in SERVICE_ACCOUNTS.items():
-        if api_key == service_account["api_key"]:
-            return service_account
-    
-    return None
+    # Looking up by HMAC digest keeps the comparison off the raw key
+    return _SERVICE_ACCOUNTS_BY_KEY_HASH.get(hash_api_key(api_key))
@@ -4,10 +4,45 @@ Provides connection pooling and helper methods for common operations
 """
 import os
 import json
+import logging
 import redis
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a dict/list value for storage"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _maybe_json(value: Any) -> Any:
+    """Serialize dict/list values, pass everything else through"""
+    if type(value) is str or type(value) is bytes:
+        return value
+    if isinstance(value, (dict, list)):
+        return _dumps(value)
+    return value
+
+
+def _maybe_json_values(values: tuple) -> tuple:
+    """``_maybe_json`` over push arguments, skipping the scan for all-string input"""
+    if all(type(v) is str or type(v) is bytes for v in values):
+        return values
+    return tuple(_dumps(v) if isinstance(v, (dict, list)) else v for v in values)
+
 
 class RedisClient:
     """Redis client with connection pooling and helper methods"""
@@ -47,15 +82,14 @@ class RedisClient:
             True if successful
         """
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            value = _maybe_json(value)
             
             if ttl:
                 return self.client.setex(key, ttl, value)
             else:
                 return self.client.set(key, value)
         except Exception as e:
-            print(f"Redis SET error: {e}")
+            logger.warning("Redis SET error: %s", e)
             return False
     
     def get(self, key: str, as_json: bool = False) -> Optional[Any]:
@@ -72,12 +106,82 @@ class RedisClient:
         try:
             value = self.client.get(key)
             if value and as_json:
-                return json.loads(value)
+                return _loads(value)
             return value
         except Exception as e:
-            print(f"Redis GET error: {e}")
+            logger.warning("Redis GET error: %s", e)
             return None
     
+    def mget(self, keys: List[str], as_json: bool = False) -> List[Optional[Any]]:
+        """
+        Get several values in one round trip
+        
+        Args:
+            keys: Cache keys
+            as_json: If True, parse values as JSON
+        
+        Returns:
+            Values in key order (None for missing keys)
+        """
+        if not keys:
+            return []
+        
+        try:
+            values = self.client.mget(keys)
+            if as_json:
+                return [_loads(v) if v else v for v in values]
+            return values
+        except Exception as e:
+            logger.warning("Redis MGET error: %s", e)
+            return [None] * len(keys)
+    
+    def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Set several key-value pairs in one round trip
+        
+        Args:
+            mapping: Key to value (dict/list values are JSON-serialized)
+            ttl: Time-to-live in seconds applied to every key (optional)
+        
+        Returns:
+            True if successful
+        """
+        if not mapping:
+            return True
+        
+        values = {k: _maybe_json(v) for k, v in mapping.items()}
+        
+        try:
+            if not ttl:
+                return self.client.mset(values)
+            
+            with self.pipeline() as pipe:
+                for key, value in values.items():
+                    pipe.set(key, value, ex=ttl)
+            return True
+        except Exception as e:
+            logger.warning("Redis MSET error: %s", e)
+            return False
+    
+    @contextmanager
+    def pipeline(self, transaction: bool = False):
+        """
+        Context manager batching raw commands into one round trip
+        
+        Commands queued on the yielded redis-py pipeline are sent when the
+        block exits cleanly (discarded if it raises). Values are passed
+        through as-is, so serialize dicts/lists before queueing. Unlike the
+        helpers, errors propagate to the caller.
+        
+        Usage:
+            with client.pipeline() as pipe:
+                pipe.lpush(key, value)
+                pipe.ltrim(key, 0, 19)
+        """
+        with self.client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            pipe.execute()
+    
     def delete(self, *keys: str) -> int:
         """
         Delete one or more keys
@@ -88,7 +192,7 @@ class RedisClient:
         try:
             return self.client.delete(*keys)
         except Exception as e:
-            print(f"Redis DELETE error: {e}")
+            logger.warning("Redis DELETE error: %s", e)
             return 0
     
     def exists(self, key: str) -> bool:
@@ -108,11 +212,9 @@ class RedisClient:
     def hset(self, name: str, key: str, value: Any) -> int:
         """Set hash field"""
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            return self.client.hset(name, key, value)
+            return self.client.hset(name, key, _maybe_json(value))
         except Exception as e:
-            print(f"Redis HSET error: {e}")
+            logger.warning("Redis HSET error: %s", e)
             return 0
     
     def hget(self, name: str, key: str, as_json: bool = False) -> Optional[Any]:
@@ -120,10 +222,10 @@ class RedisClient:
         try:
             value = self.client.hget(name, key)
             if value and as_json:
-                return json.loads(value)
+                return _loads(value)
             return value
         except Exception as e:
-            print(f"Redis HGET error: {e}")
+            logger.warning("Redis HGET error: %s", e)
             return None
     
     def hgetall(self, name: str) -> Dict[str, Any]:
@@ -131,7 +233,7 @@ class RedisClient:
         try:
             return self.client.hgetall(name)
         except Exception as e:
-            print(f"Redis HGETALL error: {e}")
+            logger.warning("Redis HGETALL error: %s", e)
             return {}
     
     def hdel(self, name: str, *keys: str) -> int:
@@ -144,16 +246,14 @@ class RedisClient:
     def lpush(self, key: str, *values: Any) -> int:
         """Push values to list (left)"""
         try:
-            json_values = [json.dumps(v) if isinstance(v, (dict, list)) else v for v in values]
-            return self.client.lpush(key, *json_values)
+            return self.client.lpush(key, *_maybe_json_values(values))
         except Exception:
             return 0
     
     def rpush(self, key: str, *values: Any) -> int:
         """Push values to list (right)"""
         try:
-            json_values = [json.dumps(v) if isinstance(v, (dict, list)) else v for v in values]
-            return self.client.rpush(key, *json_values)
+            return self.client.rpush(key, *_maybe_json_values(values))
         except Exception:
             return 0
     
@@ -162,7 +262,7 @@ class RedisClient:
         try:
             values = self.client.lrange(key, start, end)
             if as_json:
-                return [json.loads(v) for v in values]
+                return [_loads(v) for v in values]
             return values
         except Exception:
             return []
@@ -209,10 +309,22 @@ class RedisClient:
         except Exception:
             return 0
     
-    def keys(self, pattern: str = "*") -> List[str]:
-        """Get keys matching pattern"""
+    def keys(self, pattern: str = "*", count: int = 1000) -> List[str]:
+        """
+        Get keys matching pattern
+        
+        Walks the keyspace with SCAN in batches of ``count`` rather than a
+        single blocking KEYS, so other clients are served in between. SCAN
+        can report a key more than once while Redis rehashes; duplicates are
+        dropped here. Keys added or removed during the walk may or may not
+        be included.
+        
+        **Still O(N) over the whole keyspace — keep it out of hot paths.**
+        If a set of keys needs frequent enumeration, track them in a Redis
+        Set (``sadd``/``smembers``) instead.
+        """
         try:
-            return self.client.keys(pattern)
+            return list(dict.fromkeys(self.client.scan_iter(match=pattern, count=count)))
         except Exception:
             return []
     
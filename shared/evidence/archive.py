@@ -0,0 +1,79 @@
+"""
+Evidence archive packing
+Bundles evidence artifacts into a single compressed tar object
+"""
+import io
+import tarfile
+import time
+from typing import Dict, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_ARCHIVE_NAME = "evidence.tar.zst"
+GZIP_ARCHIVE_NAME = "evidence.tar.gz"
+ARCHIVE_NAMES = (ZSTD_ARCHIVE_NAME, GZIP_ARCHIVE_NAME)
+
+ZSTD_LEVEL = 3
+
+
+def pack_files(files: Dict[str, bytes]) -> Tuple[bytes, str]:
+    """
+    Pack in-memory files into an in-memory compressed tar
+
+    Uses zstd when the zstandard package is installed, gzip otherwise.
+
+    Args:
+        files: Path within the archive -> file contents
+
+    Returns:
+        (archive bytes, archive object name)
+    """
+    buffer = io.BytesIO()
+
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        with compressor.stream_writer(buffer, closefd=False) as writer:
+            with tarfile.open(mode="w|", fileobj=writer) as tar:
+                _add_entries(tar, files)
+        return buffer.getvalue(), ZSTD_ARCHIVE_NAME
+
+    with tarfile.open(mode="w:gz", fileobj=buffer) as tar:
+        _add_entries(tar, files)
+    return buffer.getvalue(), GZIP_ARCHIVE_NAME
+
+
+def unpack_archive(archive_path: str, destination: str):
+    """
+    Extract an evidence archive produced by ``pack_files``
+
+    Args:
+        archive_path: Local archive file
+        destination: Directory to extract into
+    """
+    extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+    with open(archive_path, "rb") as f:
+        if archive_path.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to unpack a .tar.zst evidence archive")
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                with tarfile.open(mode="r|", fileobj=reader) as tar:
+                    tar.extractall(destination, **extract_kwargs)
+        else:
+            with tarfile.open(mode="r:gz", fileobj=f) as tar:
+                tar.extractall(destination, **extract_kwargs)
+
+
+def _add_entries(tar: tarfile.TarFile, files: Dict[str, bytes]):
+    """Add ``files`` as regular file members in a stable (sorted) order"""
+    mtime = int(time.time())
+    for name in sorted(files):
+        data = files[name]
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = mtime
+        info.mode = 0o644
+        tar.addfile(info, io.BytesIO(data))
@@ -5,9 +5,8 @@ Constructs digital evidence packages from captured session data
 import os
 import json
 import hashlib
-import tempfile
-import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +16,8 @@ from shared.evidence.models import (
     BehaviorProfile, HARLog, HARLogEntry, PayloadArtifact,
     EvidencePointer
 )
+from shared.evidence.archive import pack_files
+from shared.evidence.checksum import file_sha256, package_sha256
 from shared.storage.minio_client import get_storage_client
 from shared.utils.metrics import (
     record_evidence_creation,
@@ -24,6 +25,36 @@ from shared.utils.metrics import (
     storage_operations
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Concurrent PUTs per evidence package upload
+UPLOAD_WORKERS = int(os.getenv("EVIDENCE_UPLOAD_WORKERS", "8"))
+
+# Upload packages as a single archive object by default
+EVIDENCE_ARCHIVE = os.getenv("EVIDENCE_ARCHIVE", "false").lower() == "true"
+
+# Store JSON artifacts zstd-compressed (read back through CerberusStorageClient)
+EVIDENCE_COMPRESS = os.getenv("EVIDENCE_COMPRESS", "true").lower() == "true"
+
+
+def _dump_json(data: Dict) -> bytes:
+    """Serialize an evidence JSON artifact (compact)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _content_type(relative_path: str) -> str:
+    """MIME type for an evidence artifact"""
+    if relative_path.endswith((".json", ".har")):
+        return "application/json"
+    if relative_path.endswith(".txt"):
+        return "text/plain"
+    return "application/octet-stream"
+
 
 class EvidenceBuilder:
     """
@@ -54,23 +85,28 @@ class EvidenceBuilder:
         self.user_agent = user_agent
         
         # Session tracking
-        self.session_start = datetime.utcnow().isoformat()
+        self._session_start_dt = datetime.utcnow()
+        self.session_start = self._session_start_dt.isoformat()
         self.session_end = None
         self.fingerprint = self._generate_fingerprint()
         
-        # Collectors
-        self.har_entries: List[HARLogEntry] = []
+        # Collectors (HAR entries are kept as plain dicts until needed and
+        # validated into models in one pass; see har_entries)
+        self._raw_har_entries: List[Dict] = []
+        self._har_entries: List[HARLogEntry] = []
         self.payloads: List[PayloadArtifact] = []
+        self._payload_bytes: List[bytes] = []  # Encoded values, hashed at build time
         self.uploaded_files: List[Dict[str, str]] = []
         self.tags: List[str] = []
         
-        # Temporary workspace
-        self.workspace = tempfile.mkdtemp(prefix=f"evidence_{event_id}_")
+        # Package artifacts (path within the package -> bytes), held in
+        # memory and uploaded straight from there
+        self.artifact_files: Dict[str, bytes] = {}
         
     def _generate_fingerprint(self) -> str:
         """Generate session fingerprint from IP + UA"""
         data = f"{self.attacker_ip}:{self.user_agent}"
-        return hashlib.md5(data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
     
     def add_har_entry(
         self,
@@ -98,37 +134,48 @@ class EvidenceBuilder:
             start_time: Request start time
             duration_ms: Total duration
         """
-        entry = HARLogEntry(
-            startedDateTime=start_time.isoformat(),
-            time=duration_ms,
-            request={
+        request_size = len(request_body)
+        response_size = len(response_body)
+        
+        self._raw_har_entries.append({
+            "startedDateTime": start_time.isoformat(),
+            "time": duration_ms,
+            "request": {
                 "method": method,
                 "url": url,
                 "httpVersion": "HTTP/1.1",
                 "headers": [{"name": k, "value": v} for k, v in request_headers.items()],
-                "bodySize": len(request_body),
+                "bodySize": request_size,
                 "postData": {"text": request_body} if request_body else {}
             },
-            response={
+            "response": {
                 "status": response_status,
                 "statusText": "OK" if 200 <= response_status < 300 else "Error",
                 "httpVersion": "HTTP/1.1",
                 "headers": [{"name": k, "value": v} for k, v in response_headers.items()],
-                "bodySize": len(response_body),
+                "bodySize": response_size,
                 "content": {
-                    "size": len(response_body),
+                    "size": response_size,
                     "mimeType": response_headers.get("Content-Type", "application/octet-stream"),
-                    "text": response_body[:1000] if len(response_body) < 10000 else None  # Truncate large responses
+                    "text": response_body[:1000] if response_size < 10000 else None  # Truncate large responses
                 }
             },
-            timings={
+            "timings": {
                 "send": 5.0,  # Estimate
                 "wait": duration_ms - 10.0,
                 "receive": 5.0
             }
-        )
-        
-        self.har_entries.append(entry)
+        })
+    
+    @property
+    def har_entries(self) -> List[HARLogEntry]:
+        """HAR entries as models, validating any pending raw entries in bulk"""
+        if self._raw_har_entries:
+            self._har_entries.extend(
+                HARLogEntry.model_validate(entry) for entry in self._raw_har_entries
+            )
+            self._raw_har_entries.clear()
+        return self._har_entries
     
     def add_payload(
         self,
@@ -149,15 +196,12 @@ class EvidenceBuilder:
             save_as_file: Whether to save payload as separate file
         """
         artifact_id = f"payload_{len(self.payloads):03d}"
-        checksum = hashlib.sha256(payload_value.encode()).hexdigest()
+        data = payload_value.encode()
         
         file_path = None
         if save_as_file:
             file_path = f"payloads/{artifact_id}.txt"
-            full_path = os.path.join(self.workspace, file_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, 'w') as f:
-                f.write(payload_value)
+            self.artifact_files[file_path] = data
         
         payload = PayloadArtifact(
             artifact_id=artifact_id,
@@ -166,10 +210,11 @@ class EvidenceBuilder:
             location=location,
             confidence=confidence,
             file_path=file_path,
-            checksum=checksum
+            checksum=None  # Filled in by build_and_upload
         )
         
         self.payloads.append(payload)
+        self._payload_bytes.append(data)
     
     def add_uploaded_file(self, filename: str, file_path: str, file_size: int):
         """
@@ -180,8 +225,7 @@ class EvidenceBuilder:
             file_path: Path where file is stored
             file_size: File size in bytes
         """
-        with open(file_path, 'rb') as f:
-            checksum = hashlib.sha256(f.read()).hexdigest()
+        checksum = file_sha256(file_path)
         
         self.uploaded_files.append({
             "filename": filename,
@@ -198,7 +242,8 @@ class EvidenceBuilder:
     def build_and_upload(
         self,
         bucket_name: str = "labyrinth-evidence",
-        behavior_profile: Optional[BehaviorProfile] = None
+        behavior_profile: Optional[BehaviorProfile] = None,
+        archive: bool = EVIDENCE_ARCHIVE
     ) -> EvidencePointer:
         """
         Build evidence package and upload to MinIO
@@ -206,19 +251,22 @@ class EvidenceBuilder:
         Args:
             bucket_name: Target MinIO bucket
             behavior_profile: Optional behavioral analysis
+            archive: Upload the package as one compressed tar object instead
+                of one object per artifact
             
         Returns:
             Evidence pointer for messaging
         """
-        self.session_end = datetime.utcnow().isoformat()
+        session_end_dt = datetime.utcnow()
+        self.session_end = session_end_dt.isoformat()
+        
+        self._fill_payload_checksums()
         
         # Create HAR log
         har_log = HARLog(entries=self.har_entries)
         
-        # Save HAR to workspace
-        har_path = os.path.join(self.workspace, "session.har")
-        with open(har_path, 'w') as f:
-            json.dump(har_log.model_dump(), f, indent=2)
+        # Serialize HAR
+        self.artifact_files["session.har"] = _dump_json(har_log.model_dump())
         
         # Save metadata
         session_meta = SessionMetadata(
@@ -229,8 +277,7 @@ class EvidenceBuilder:
             session_start=self.session_start,
             session_end=self.session_end,
             request_count=len(self.har_entries),
-            total_duration_ms=int((datetime.fromisoformat(self.session_end) - 
-                                  datetime.fromisoformat(self.session_start)).total_seconds() * 1000),
+            total_duration_ms=int((session_end_dt - self._session_start_dt).total_seconds() * 1000),
             tags=self.tags
         )
         
@@ -244,52 +291,27 @@ class EvidenceBuilder:
             tags=self.tags
         )
         
-        metadata_path = os.path.join(self.workspace, "metadata.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(evidence_metadata.model_dump(), f, indent=2)
+        self.artifact_files["metadata.json"] = _dump_json(evidence_metadata.model_dump())
         
         # Save behavior profile if provided
         if behavior_profile:
-            behavior_path = os.path.join(self.workspace, "behavior.json")
-            with open(behavior_path, 'w') as f:
-                json.dump(behavior_profile.model_dump(), f, indent=2)
+            self.artifact_files["behavior.json"] = _dump_json(behavior_profile.model_dump())
         
         # Upload to MinIO
         upload_start = time.time()
         storage = get_storage_client()
         storage.ensure_bucket(bucket_name)
         
-        # Upload all files in workspace
-        uploaded_artifacts = []
-        for root, dirs, files in os.walk(self.workspace):
-            for file in files:
-                local_path = os.path.join(root, file)
-                relative_path = os.path.relpath(local_path, self.workspace)
-                object_name = f"{self.event_id}/{relative_path}"
-
-                try:
-                    upload_info = storage.upload_file(
-                        bucket_name,
-                        object_name,
-                        local_path
-                    )
-                    uploaded_artifacts.append(upload_info)
-                    storage_operations.labels(
-                        service="labyrinth",
-                        operation="upload",
-                        status="success"
-                    ).inc()
-                except Exception:
-                    storage_operations.labels(
-                        service="labyrinth",
-                        operation="upload",
-                        status="error"
-                    ).inc()
-                    raise
+        if archive:
+            # One PUT for the whole package
+            uploaded_artifacts = [self._upload_archive(storage, bucket_name)]
+        else:
+            uploaded_artifacts = self._upload_artifacts(storage, bucket_name)
         
         # Calculate package checksum
-        all_checksums = "".join([a["checksum"] for a in uploaded_artifacts])
-        package_checksum = hashlib.sha256(all_checksums.encode()).hexdigest()
+        package_checksum = package_sha256(
+            {artifact["object"]: artifact["checksum"] for artifact in uploaded_artifacts}
+        )
 
         # Create evidence pointer
         pointer = EvidencePointer(
@@ -320,7 +342,64 @@ class EvidenceBuilder:
                 payload_type=payload.payload_type
             ).inc()
         
-        # Cleanup workspace
-        shutil.rmtree(self.workspace, ignore_errors=True)
-        
         return pointer
+    
+    def _fill_payload_checksums(self):
+        """Compute SHA-256 checksums for all payloads added so far, in one pass"""
+        for payload, data in zip(self.payloads, self._payload_bytes):
+            if payload.checksum is None:
+                payload.checksum = hashlib.sha256(data).hexdigest()
+    
+    def _upload_artifacts(self, storage, bucket_name: str) -> List[Dict]:
+        """Upload each artifact as its own object, concurrently"""
+        uploaded_artifacts = []
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = [
+                executor.submit(
+                    storage.upload_bytes,
+                    bucket_name,
+                    f"{self.event_id}/{relative_path}",
+                    data,
+                    content_type=_content_type(relative_path),
+                    compress=EVIDENCE_COMPRESS and relative_path.endswith((".json", ".har"))
+                )
+                for relative_path, data in self.artifact_files.items()
+            ]
+            
+            for future in as_completed(futures):
+                try:
+                    uploaded_artifacts.append(future.result())
+                    self._record_upload("success")
+                except Exception:
+                    self._record_upload("error")
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+        
+        return uploaded_artifacts
+    
+    def _upload_archive(self, storage, bucket_name: str) -> Dict:
+        """Pack all artifacts into a compressed tar and upload it"""
+        data, archive_name = pack_files(self.artifact_files)
+        
+        try:
+            upload_info = storage.upload_bytes(
+                bucket_name,
+                f"{self.event_id}/{archive_name}",
+                data,
+                content_type="application/x-tar"
+            )
+        except Exception:
+            self._record_upload("error")
+            raise
+        
+        self._record_upload("success")
+        return upload_info
+    
+    @staticmethod
+    def _record_upload(status: str):
+        storage_operations.labels(
+            service="labyrinth",
+            operation="upload",
+            status=status
+        ).inc()
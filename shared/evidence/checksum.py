@@ -0,0 +1,36 @@
+"""
+Evidence checksums
+Streaming SHA-256 helpers shared by the builder and retriever
+"""
+import hashlib
+from typing import Dict
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 of a file, read in fixed-size chunks (constant memory)"""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        
+        digest = hashlib.sha256()
+        buffer = memoryview(bytearray(1 << 16))
+        while n := f.readinto(buffer):
+            digest.update(buffer[:n])
+        return digest.hexdigest()
+
+
+def package_sha256(checksums: Dict[str, str]) -> str:
+    """
+    Package checksum over per-artifact SHA-256s
+    
+    Digests are folded in object-name order so the builder (upload order)
+    and retriever (listing/download order) agree regardless of the order
+    artifacts were processed in.
+    
+    Args:
+        checksums: Object name -> hex SHA-256 of the artifact
+    """
+    digest = hashlib.sha256()
+    for object_name in sorted(checksums):
+        digest.update(checksums[object_name].encode("ascii"))
+    return digest.hexdigest()
@@ -0,0 +1,70 @@
+"""
+Column-wise HAR views for evidence analytics
+Kept apart from the core models so only analytics code imports numpy
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+from shared.evidence.models import HARLogEntry
+
+
+# Categorical codes for HARLogColumnar.methods; unknown verbs map to "OTHER"
+HTTP_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS", "OTHER")
+_METHOD_CODES = {method: code for code, method in enumerate(HTTP_METHODS)}
+
+
+class HARLogColumnar(BaseModel):
+    """
+    Column-wise (struct-of-arrays) view of a HAR log for analytics
+    
+    Row ``i`` of every array describes ``HARLog.entries[i]``. Scans over
+    timings/statuses touch only the arrays they need instead of a model and
+    its request/response dicts per entry.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+    
+    start_times: np.ndarray  # float64 epoch seconds (NaN if unparseable)
+    durations: np.ndarray  # float64 milliseconds
+    statuses: np.ndarray  # int64 HTTP status (0 if missing)
+    methods: np.ndarray  # uint8 index into HTTP_METHODS
+    url_ids: np.ndarray  # int32 index into urls
+    urls: List[str]  # Distinct request URLs
+    
+    def __len__(self) -> int:
+        return len(self.durations)
+
+
+def _epoch_seconds(timestamp: str) -> float:
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def har_columnar(entries: Sequence[HARLogEntry]) -> HARLogColumnar:
+    """Build the column-wise view of HAR ``entries`` (one pass per column)"""
+    count = len(entries)
+    other = _METHOD_CODES["OTHER"]
+    url_index: Dict[str, int] = {}
+    
+    return HARLogColumnar(
+        start_times=np.fromiter(
+            (_epoch_seconds(e.startedDateTime) for e in entries), dtype=np.float64, count=count
+        ),
+        durations=np.fromiter((e.time for e in entries), dtype=np.float64, count=count),
+        statuses=np.fromiter(
+            (e.response.get("status") or 0 for e in entries), dtype=np.int64, count=count
+        ),
+        methods=np.fromiter(
+            (_METHOD_CODES.get(e.request.get("method"), other) for e in entries),
+            dtype=np.uint8, count=count
+        ),
+        url_ids=np.fromiter(
+            (url_index.setdefault(e.request.get("url", ""), len(url_index)) for e in entries),
+            dtype=np.int32, count=count
+        ),
+        urls=list(url_index)
+    )
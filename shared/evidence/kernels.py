@@ -0,0 +1,72 @@
+"""
+Evidence analysis kernels
+Vectorized scans over HAR timings and statuses for post-retrieval stats
+"""
+import logging
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from shared.evidence.columnar import HARLogColumnar
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+# Status classes 0xx-5xx; anything above is folded into the last bucket
+STATUS_CLASSES = 6
+
+
+def _jit(signature: str) -> Callable[[Callable], Callable]:
+    """
+    Compile eagerly with numba when installed, otherwise run as plain NumPy
+    
+    Compiling against an explicit signature pays the JIT cost at import
+    instead of on the first evidence package.
+    """
+    def decorate(func):
+        if njit is None:
+            return func
+        try:
+            return njit(signature, cache=True)(func)
+        except Exception as e:
+            logger.warning("numba compile of %s failed, using NumPy: %s", func.__name__, e)
+            return func
+    return decorate
+
+
+@_jit("float64(float64[:])")
+def sum_durations(times):
+    """Total request time (ms)"""
+    return times.sum()
+
+
+@_jit("int64[:](int64[:])")
+def count_by_status_class(statuses):
+    """Requests per status class (index 2 -> 2xx, ...)"""
+    classes = np.minimum(statuses // 100, STATUS_CLASSES - 1)
+    return np.bincount(classes, minlength=STATUS_CLASSES)
+
+
+def har_stats(columns: HARLogColumnar) -> Dict[str, Any]:
+    """
+    Summary statistics for a HAR log
+    
+    Args:
+        columns: Column-wise view from ``HARLog.to_columnar()``
+    """
+    count = len(columns)
+    total_ms = float(sum_durations(columns.durations))
+    by_class = count_by_status_class(columns.statuses)
+    
+    return {
+        "request_count": count,
+        "total_time_ms": total_ms,
+        "mean_time_ms": total_ms / count if count else 0.0,
+        "status_classes": {
+            f"{i}xx": int(n) for i, n in enumerate(by_class) if n
+        }
+    }
@@ -2,11 +2,27 @@
 Evidence Package Models for Cerberus Digital Evidence Locker
 Defines structured formats for forensic evidence collection
 """
-from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, List, Dict, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from uuid import uuid4
 
+if TYPE_CHECKING:
+    from shared.evidence.columnar import HARLogColumnar
+
+
+# Default factories: plain functions with their globals bound as defaults
+def _payload_id(_uuid4=uuid4) -> str:
+    return "payload_" + _uuid4().hex[:8]
+
+
+def _capture_id(_uuid4=uuid4) -> str:
+    return "cap_" + _uuid4().hex[:8]
+
+
+def _utcnow_iso(_utcnow=datetime.utcnow) -> str:
+    return _utcnow().isoformat()
+
 
 class HARLogEntry(BaseModel):
     """HTTP Archive (HAR) log entry for a single request/response pair"""
@@ -26,12 +42,17 @@ class HARLog(BaseModel):
     creator: Dict[str, str] = {"name": "Cerberus Labyrinth", "version": "1.0"}
     pages: List[Dict[str, Any]] = []
     entries: List[HARLogEntry] = []
+    
+    def to_columnar(self) -> "HARLogColumnar":
+        """Build the column-wise view of ``entries`` (requires numpy)"""
+        from shared.evidence.columnar import har_columnar
+        return har_columnar(self.entries)
 
 
 class PayloadArtifact(BaseModel):
     """Individual malicious payload captured"""
-    artifact_id: str = Field(default_factory=lambda: f"payload_{uuid4().hex[:8]}")
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    artifact_id: str = Field(default_factory=_payload_id)
+    timestamp: str = Field(default_factory=_utcnow_iso)
     payload_type: str  # sql_injection, xss, command_injection, file_upload, etc.
     payload_value: str  # The actual malicious content
     location: str  # Where it was found (query.id, body.username, etc.)
@@ -76,8 +97,8 @@ class BehaviorProfile(BaseModel):
 class EvidenceMetadata(BaseModel):
     """Metadata for the complete evidence package"""
     event_id: str
-    capture_id: str = Field(default_factory=lambda: f"cap_{uuid4().hex[:8]}")
-    created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    capture_id: str = Field(default_factory=_capture_id)
+    created_at: str = Field(default_factory=_utcnow_iso)
     created_by: str = "labyrinth"
     session_metadata: SessionMetadata
     behavior_profile: Optional[BehaviorProfile] = None
@@ -93,8 +114,11 @@ class EvidencePackage(BaseModel):
     """
     Complete digital evidence package for a captured attack session
     
-    This represents the "Digital Evidence Bag" stored in MinIO
+    This represents the "Digital Evidence Bag" stored in MinIO. Packages
+    are frozen once built; use model_copy(update=...) to derive a new one.
     """
+    model_config = ConfigDict(frozen=True)
+    
     metadata: EvidenceMetadata
     har_log: HARLog
     payloads: List[PayloadArtifact]
@@ -102,21 +126,25 @@ class EvidencePackage(BaseModel):
     
     def to_manifest(self) -> Dict[str, Any]:
         """Generate manifest of evidence package contents"""
+        # Resolve each nested model once instead of per key
+        metadata = self.metadata
+        session = metadata.session_metadata
+        payloads = self.payloads
         return {
-            "event_id": self.metadata.event_id,
-            "capture_id": self.metadata.capture_id,
-            "created_at": self.metadata.created_at,
-            "session_id": self.metadata.session_metadata.session_id,
-            "attacker_ip": self.metadata.session_metadata.attacker_ip,
+            "event_id": metadata.event_id,
+            "capture_id": metadata.capture_id,
+            "created_at": metadata.created_at,
+            "session_id": session.session_id,
+            "attacker_ip": session.attacker_ip,
             "artifacts": {
                 "har_log": "session.har",
-                "payloads": [p.artifact_id for p in self.payloads],
+                "payloads": [p.artifact_id for p in payloads],
                 "metadata": "metadata.json",
-                "behavior": "behavior.json" if self.metadata.behavior_profile else None
+                "behavior": "behavior.json" if metadata.behavior_profile else None
             },
-            "total_payloads": len(self.payloads),
+            "total_payloads": len(payloads),
             "total_requests": len(self.har_log.entries),
-            "storage_location": self.metadata.storage_location
+            "storage_location": metadata.storage_location
         }
 
 
@@ -132,11 +160,20 @@ class EvidencePointer(BaseModel):
     session_id: str
     attacker_ip: str
     location: str  # s3://bucket/event_id/
-    timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = Field(default_factory=_utcnow_iso)
     payload_count: int
     request_count: int
     checksum: Optional[str] = None  # Package checksum for validation
     tags: List[str] = []
+    
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "EvidencePointer":
+        """
+        Rebuild a pointer from a dict this process produced (e.g. model_dump())
+        
+        Skips validation entirely; never use on data received from the bus.
+        """
+        return cls.model_construct(**data)
 
 
 # Sample evidence package for testing
@@ -0,0 +1,64 @@
+"""
+msgspec mirrors of the HAR evidence models
+Decodes session.har straight into msgspec structs; converts to the Pydantic
+models (without re-validating) only at the edge where callers expect them
+"""
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+from shared.evidence import models
+
+
+class HARLogEntry(msgspec.Struct):
+    """msgspec counterpart of ``models.HARLogEntry``"""
+    startedDateTime: str
+    time: float  # milliseconds
+    request: Dict[str, Any]
+    response: Dict[str, Any]
+    cache: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    serverIPAddress: Optional[str] = None
+    connection: Optional[str] = None
+
+
+class HARLog(msgspec.Struct):
+    """msgspec counterpart of ``models.HARLog``"""
+    version: str = "1.2"
+    creator: Dict[str, str] = msgspec.field(
+        default_factory=lambda: {"name": "Cerberus Labyrinth", "version": "1.0"}
+    )
+    pages: List[Dict[str, Any]] = []
+    entries: List[HARLogEntry] = []
+
+
+_HAR_DECODER = msgspec.json.Decoder(HARLog)
+
+
+def decode_har(data: bytes) -> models.HARLog:
+    """
+    Parse and validate session.har with msgspec
+    
+    msgspec has already type-checked every field, so the Pydantic models are
+    assembled with ``model_construct`` instead of being validated again.
+    """
+    har = _HAR_DECODER.decode(data)
+    construct_entry = models.HARLogEntry.model_construct
+    return models.HARLog.model_construct(
+        version=har.version,
+        creator=har.creator,
+        pages=har.pages,
+        entries=[
+            construct_entry(
+                startedDateTime=e.startedDateTime,
+                time=e.time,
+                request=e.request,
+                response=e.response,
+                cache=e.cache,
+                timings=e.timings,
+                serverIPAddress=e.serverIPAddress,
+                connection=e.connection
+            )
+            for e in har.entries
+        ]
+    )
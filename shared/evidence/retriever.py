@@ -2,28 +2,80 @@
 Evidence Retriever for Sentinel
 Downloads and validates evidence packages from MinIO
 """
+import asyncio
+import functools
 import os
-import json
-import hashlib
 import tempfile
 import shutil
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from pydantic import TypeAdapter
+
 from shared.evidence.models import (
     EvidencePackage, EvidenceMetadata, HARLog,
     PayloadArtifact, EvidencePointer
 )
+from shared.evidence.archive import ARCHIVE_NAMES, unpack_archive
+from shared.evidence.checksum import package_sha256
+from shared.evidence.kernels import har_stats
 from shared.storage.minio_client import get_storage_client
 import logging
 
+try:
+    from shared.evidence import models_fast
+except ImportError:  # msgspec not installed
+    models_fast = None
+
 logger = logging.getLogger(__name__)
 
+# Validators resolved once at import and reused for every package
+_METADATA_ADAPTER = TypeAdapter(EvidenceMetadata)
+_HAR_ADAPTER = TypeAdapter(HARLog)
+_validate_metadata = _METADATA_ADAPTER.validate_json
+_validate_har = _HAR_ADAPTER.validate_json
+
+# session.har is the largest artifact; decode it with msgspec when available
+_decode_har = models_fast.decode_har if models_fast is not None else _validate_har
+
+# Concurrent GETs per evidence package download
+DOWNLOAD_WORKERS = int(os.getenv("EVIDENCE_DOWNLOAD_WORKERS", "8"))
+
+
+@functools.lru_cache(maxsize=256)
+def _load_metadata_cached(path: str, mtime_ns: int, size: int) -> EvidenceMetadata:
+    """Parse metadata.json; (mtime_ns, size) key out stale entries when the file changes"""
+    with open(path, 'rb') as f:
+        return _validate_metadata(f.read())
+
+
+def _parse_s3_location(location: str) -> Tuple[str, str]:
+    """Split ``s3://bucket/event_id/`` into (bucket, prefix) in one pass"""
+    start = 5 if location.startswith("s3://") else 0
+    slash = location.find("/", start)
+    if slash < 0:
+        return location[start:], ""
+    return location[start:slash], location[slash + 1:]
+
+
+def _load_metadata(path: str) -> Optional[EvidenceMetadata]:
+    """Cached metadata for ``path`` (shared instance; treat as read-only), None if absent"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return _load_metadata_cached(path, st.st_mtime_ns, st.st_size)
+
 
 class EvidenceRetriever:
     """
     Retrieves and validates evidence packages from MinIO storage
     
+    Pointers and artifacts are validated once, when they are read here;
+    code that later rebuilds a pointer from its own ``model_dump()`` can use
+    ``EvidencePointer.from_trusted`` to skip re-validation.
+    
     Workflow:
     1. Receive evidence pointer from message bus
     2. Download artifacts from MinIO to temporary workspace
@@ -55,6 +107,8 @@ class EvidenceRetriever:
             {
                 "metadata": EvidenceMetadata,
                 "har_log": HARLog,
+                "har_columns": HARLogColumnar (column-wise view for analytics, or None),
+                "har_stats": Dict (request timing / status summary, or None),
                 "payloads": List[PayloadArtifact],
                 "workspace": str (path to downloaded files),
                 "valid": bool (checksum validation result)
@@ -68,11 +122,7 @@ class EvidenceRetriever:
         os.makedirs(workspace, exist_ok=True)
         
         try:
-            # Parse S3 location
-            # Format: s3://bucket/event_id/
-            location_parts = pointer.location.replace("s3://", "").split("/", 1)
-            bucket_name = location_parts[0]
-            prefix = location_parts[1] if len(location_parts) > 1 else ""
+            bucket_name, prefix = _parse_s3_location(pointer.location)
             
             # List all objects in evidence folder
             objects = self.storage.list_objects(
@@ -83,30 +133,38 @@ class EvidenceRetriever:
             
             logger.info(f"Found {len(objects)} artifacts for {event_id}")
             
-            # Download all artifacts
-            downloaded_checksums = []
-            for obj in objects:
-                object_name = obj["name"]
-                local_filename = object_name.replace(f"{event_id}/", "")
-                local_path = os.path.join(workspace, local_filename)
-                
-                # Create subdirectories if needed
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                
-                # Download
-                self.storage.download_file(bucket_name, object_name, local_path)
-                
-                # Track checksum
-                with open(local_path, 'rb') as f:
-                    checksum = hashlib.sha256(f.read()).hexdigest()
-                    downloaded_checksums.append(checksum)
+            # Download and hash all artifacts concurrently
+            workspace_prefix = workspace + "/"
+            event_prefix = f"{event_id}/"
+            local_paths = {
+                obj["name"]: workspace_prefix + obj["name"].replace(event_prefix, "")
+                for obj in objects
+            }
+            
+            # One makedirs per distinct directory, not per artifact
+            for directory in {os.path.dirname(path) for path in local_paths.values()}:
+                os.makedirs(directory, exist_ok=True)
+            
+            checksums = {}
+            if local_paths:
+                workers = min(DOWNLOAD_WORKERS, len(local_paths))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        lambda item: self._download_artifact(bucket_name, *item),
+                        local_paths.items()
+                    )
+                    checksums = dict(zip(local_paths, results))
+            
+            # Packages uploaded as one archive are unpacked in place
+            for local_path in local_paths.values():
+                if os.path.relpath(local_path, workspace) in ARCHIVE_NAMES:
+                    unpack_archive(local_path, workspace)
+                    os.remove(local_path)
             
             # Validate package checksum if provided
             valid = True
             if pointer.checksum:
-                calculated_checksum = hashlib.sha256(
-                    "".join(downloaded_checksums).encode()
-                ).hexdigest()
+                calculated_checksum = package_sha256(checksums)
                 
                 if calculated_checksum != pointer.checksum:
                     logger.warning(f"Checksum mismatch for {event_id}: expected {pointer.checksum}, got {calculated_checksum}")
@@ -118,16 +176,15 @@ class EvidenceRetriever:
             metadata_path = os.path.join(workspace, "metadata.json")
             har_path = os.path.join(workspace, "session.har")
             
-            metadata = None
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    metadata = EvidenceMetadata.model_validate_json(f.read())
+            metadata = _load_metadata(metadata_path)
             
             har_log = None
             if os.path.exists(har_path):
-                with open(har_path, 'r') as f:
-                    har_data = json.load(f)
-                    har_log = HARLog.model_validate(har_data)
+                with open(har_path, 'rb') as f:
+                    har_log = _decode_har(f.read())
+            
+            # Column-wise view built once for downstream analytics
+            har_columns = har_log.to_columnar() if har_log else None
             
             # Extract payloads from metadata
             payloads = []
@@ -140,6 +197,8 @@ class EvidenceRetriever:
                 "event_id": event_id,
                 "metadata": metadata,
                 "har_log": har_log,
+                "har_columns": har_columns,
+                "har_stats": har_stats(har_columns) if har_columns is not None else None,
                 "payloads": payloads,
                 "workspace": workspace,
                 "valid": valid,
@@ -152,6 +211,14 @@ class EvidenceRetriever:
             shutil.rmtree(workspace, ignore_errors=True)
             raise
     
+    async def retrieve_async(self, pointer: EvidencePointer) -> Dict[str, any]:
+        """Run ``retrieve`` on a worker thread without blocking the event loop"""
+        return await asyncio.to_thread(self.retrieve, pointer)
+    
+    def _download_artifact(self, bucket_name: str, object_name: str, local_path: str) -> str:
+        """Download one artifact and return its SHA-256 (hashed while streaming)"""
+        return self.storage.download_and_hash(bucket_name, object_name, local_path)["checksum"]
+    
     def get_har_log(self, workspace: str) -> Optional[HARLog]:
         """
         Load HAR log from workspace
@@ -166,9 +233,8 @@ class EvidenceRetriever:
         if not os.path.exists(har_path):
             return None
         
-        with open(har_path, 'r') as f:
-            har_data = json.load(f)
-            return HARLog.model_validate(har_data)
+        with open(har_path, 'rb') as f:
+            return _decode_har(f.read())
     
     def get_metadata(self, workspace: str) -> Optional[EvidenceMetadata]:
         """
@@ -180,12 +246,7 @@ class EvidenceRetriever:
         Returns:
             Evidence metadata or None
         """
-        metadata_path = os.path.join(workspace, "metadata.json")
-        if not os.path.exists(metadata_path):
-            return None
-        
-        with open(metadata_path, 'r') as f:
-            return EvidenceMetadata.model_validate_json(f.read())
+        return _load_metadata(os.path.join(workspace, "metadata.json"))
     
     def get_payload_files(self, workspace: str) -> List[str]:
         """
@@ -0,0 +1,95 @@
+"""
+Payload signature scanning
+Matches a set of regex signatures against captured payload values
+"""
+import functools
+import re
+from typing import Iterable, List, Sequence, Tuple
+
+from shared.evidence.models import PayloadArtifact
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+class _RegexDatabase:
+    """Fallback used when hyperscan is not installed: one compiled ``re`` per pattern"""
+    
+    def __init__(self, patterns: Sequence[bytes]):
+        self.patterns = [re.compile(p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in patterns]
+    
+    def matches(self, data: bytes) -> List[int]:
+        return [i for i, pattern in enumerate(self.patterns) if pattern.search(data)]
+
+
+def build_db(patterns: Sequence[bytes]):
+    """
+    Compile ``patterns`` once into a scan database (cached per pattern set)
+    
+    With hyperscan installed this is a single block-mode DFA over every
+    pattern; otherwise a list of compiled regexes.
+    
+    Args:
+        patterns: Signatures as bytes regexes; the pattern id is its index
+    """
+    return _build_db(tuple(patterns))
+
+
+@functools.lru_cache(maxsize=16)
+def _build_db(patterns: Tuple[bytes, ...]):
+    if hyperscan is None:
+        return _RegexDatabase(patterns)
+    
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_MULTILINE
+        | hyperscan.HS_FLAG_DOTALL
+        | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    db.compile(
+        expressions=list(patterns),
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        flags=[flags] * len(patterns)
+    )
+    return db
+
+
+def scan_payloads(db, payloads: Iterable[PayloadArtifact]) -> List[Tuple[str, int]]:
+    """
+    Find which signatures match each payload
+    
+    Each payload is scanned on its own so a match can never span two
+    payloads; with hyperscan every scan is one pass of the shared DFA.
+    
+    Args:
+        db: Database from ``build_db``
+        payloads: Captured payload artifacts
+    
+    Returns:
+        (artifact_id, pattern_id) pairs, one per matching signature
+    """
+    results: List[Tuple[str, int]] = []
+    
+    if isinstance(db, _RegexDatabase):
+        for payload in payloads:
+            data = payload.payload_value.encode("utf-8", "surrogateescape")
+            results.extend((payload.artifact_id, i) for i in db.matches(data))
+        return results
+    
+    scratch = hyperscan.Scratch(db)
+    for payload in payloads:
+        artifact_id = payload.artifact_id
+        
+        def on_match(pattern_id, start, end, flags, context):
+            results.append((artifact_id, pattern_id))
+        
+        db.scan(
+            payload.payload_value.encode("utf-8", "surrogateescape"),
+            match_event_handler=on_match,
+            scratch=scratch
+        )
+    return results
@@ -5,12 +5,56 @@ Handles evidence pointers, telemetry, and cross-service events
 import os
 import json
 import logging
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Union
 from kafka import KafkaProducer, KafkaConsumer
 from kafka.errors import KafkaError
+from pydantic import TypeAdapter
+
+from shared.evidence.models import EvidencePointer
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# lz4 is cheap enough to leave on for synchronous sends; without it,
+# messages go uncompressed rather than paying for gzip on every publish
+try:
+    import lz4  # noqa: F401  (enables kafka-python's lz4 codec)
+    _COMPRESSION = "lz4"
+except ImportError:
+    _COMPRESSION = None
+
+
+# Kafka value (de)serializers, bound once for the producer/consumer hot loop
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value).encode('utf-8')
+
+    def _loads(value: bytes) -> Any:
+        return json.loads(value)
+
+
+# Idempotent producers (kafka-python >= 2.1) keep per-partition order with
+# several requests in flight. The pinned 2.0.2 client has no idempotence, so
+# it retries a few times with one request in flight to keep ordering.
+if "enable_idempotence" in KafkaProducer.DEFAULT_CONFIG:
+    _DELIVERY_CONFIG = {
+        "enable_idempotence": True,
+        "retries": 2**31 - 1,
+        "max_in_flight_requests_per_connection": 5
+    }
+else:
+    _DELIVERY_CONFIG = {"retries": 3, "max_in_flight_requests_per_connection": 1}
+
+# Dumps a pointer model straight to JSON bytes (no intermediate dict)
+_POINTER_ADAPTER = TypeAdapter(EvidencePointer)
+
 
 class CerberusEventBus:
     """
@@ -51,10 +95,10 @@ class CerberusEventBus:
             self.producer = KafkaProducer(
                 bootstrap_servers=self.bootstrap_servers.split(","),
                 client_id=self.client_id,
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
                 acks='all',  # Wait for all replicas
-                retries=3,
-                max_in_flight_requests_per_connection=1  # Ensure ordering
+                batch_size=64 * 1024,
+                compression_type=_COMPRESSION,
+                **_DELIVERY_CONFIG
             )
             logger.info("Kafka producer created")
         return self.producer
@@ -63,7 +107,8 @@ class CerberusEventBus:
         self,
         topic: str,
         message: Dict[str, Any],
-        key: Optional[str] = None
+        key: Optional[str] = None,
+        batch: bool = False
     ) -> bool:
         """
         Publish message to topic
@@ -72,16 +117,52 @@ class CerberusEventBus:
             topic: Kafka topic name
             message: Message dict (will be JSON serialized)
             key: Optional message key for partitioning
+            batch: If True, queue the message and return without waiting for
+                the broker ack; delivery failures are logged from a callback.
+                Call ``flush()`` to drain.
+            
+        Returns:
+            True if published (or queued, when batching) successfully
+        """
+        try:
+            value = _dumps(message)
+        except Exception as e:
+            logger.error(f"Failed to serialize message for {topic}: {e}")
+            return False
+        
+        return self.publish_raw(topic, value, key=key, batch=batch)
+    
+    def publish_raw(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[str] = None,
+        batch: bool = False
+    ) -> bool:
+        """
+        Publish an already-serialized message to topic
+        
+        Args:
+            topic: Kafka topic name
+            value: Message body as JSON bytes, sent as-is
+            key: Optional message key for partitioning
+            batch: See ``publish``
             
         Returns:
-            True if published successfully
+            True if published (or queued, when batching) successfully
         """
         try:
             producer = self.get_producer()
             
             key_bytes = key.encode('utf-8') if key else None
             
-            future = producer.send(topic, value=message, key=key_bytes)
+            future = producer.send(topic, value=value, key=key_bytes)
+            if batch:
+                future.add_errback(
+                    lambda e: logger.error(f"Failed to publish to {topic}: {e}")
+                )
+                return True
+            
             record_metadata = future.get(timeout=10)
             
             logger.debug(
@@ -98,60 +179,75 @@ class CerberusEventBus:
             logger.error(f"Unexpected error publishing to {topic}: {e}")
             return False
     
-    def publish_evidence_pointer(self, pointer_dict: Dict[str, Any]) -> bool:
+    def publish_evidence_pointer(self, pointer: Union[EvidencePointer, Dict[str, Any]]) -> bool:
         """
         Publish evidence pointer to dedicated topic
         
         Args:
-            pointer_dict: Evidence pointer as dict
+            pointer: Evidence pointer, or an already-dumped pointer dict.
+                A model is serialized straight to JSON bytes without being
+                re-validated.
             
         Returns:
             True if published
         """
+        if isinstance(pointer, EvidencePointer):
+            return self.publish_raw(
+                "cerberus.evidence.ready",
+                _POINTER_ADAPTER.dump_json(pointer),
+                key=pointer.event_id
+            )
+        
+        pointer_dict = pointer
         return self.publish(
             "cerberus.evidence.ready",
             pointer_dict,
             key=pointer_dict.get("event_id")
         )
     
-    def publish_telemetry(self, event_dict: Dict[str, Any]) -> bool:
+    def publish_telemetry(self, event_dict: Dict[str, Any], batch: bool = False) -> bool:
         """
         Publish telemetry event
         
         Args:
             event_dict: Telemetry event dict
+            batch: Queue without waiting for the broker ack (see ``publish``)
             
         Returns:
-            True if published
+            True if published (or queued, when batching)
         """
         return self.publish(
             "cerberus.telemetry",
             event_dict,
-            key=event_dict.get("session_id")
+            key=event_dict.get("session_id"),
+            batch=batch
         )
     
-    def publish_alert(self, alert_dict: Dict[str, Any]) -> bool:
+    def publish_alert(self, alert_dict: Dict[str, Any], batch: bool = False) -> bool:
         """
         Publish security alert
         
         Args:
             alert_dict: Alert dict
+            batch: Queue without waiting for the broker ack (see ``publish``)
             
         Returns:
-            True if published
+            True if published (or queued, when batching)
         """
         return self.publish(
             "cerberus.alerts",
             alert_dict,
-            key=alert_dict.get("event_id")
+            key=alert_dict.get("event_id"),
+            batch=batch
         )
     
     def subscribe(
         self,
         topic: str,
         group_id: str,
-        handler: Callable[[Dict[str, Any]], None],
-        auto_offset_reset: str = 'latest'
+        handler: Callable[[Any], None],
+        auto_offset_reset: str = 'latest',
+        deserializer: Optional[Callable[[bytes], Any]] = None
     ):
         """
         Subscribe to topic and process messages
@@ -161,6 +257,9 @@ class CerberusEventBus:
             group_id: Consumer group ID
             handler: Function to call for each message
             auto_offset_reset: Where to start reading ('earliest' or 'latest')
+            deserializer: Parses raw message bytes (default: JSON to dict).
+                Pass a model's ``model_validate_json`` to parse and validate
+                in one pass; messages it rejects are logged and skipped.
         """
         try:
             consumer = KafkaConsumer(
@@ -168,7 +267,7 @@ class CerberusEventBus:
                 bootstrap_servers=self.bootstrap_servers.split(","),
                 client_id=self.client_id,
                 group_id=group_id,
-                value_deserializer=lambda v: json.loads(v.decode('utf-8')),
+                value_deserializer=None if deserializer else _loads,
                 auto_offset_reset=auto_offset_reset,
                 enable_auto_commit=True
             )
@@ -179,7 +278,8 @@ class CerberusEventBus:
             # Process messages
             for message in consumer:
                 try:
-                    handler(message.value)
+                    value = deserializer(message.value) if deserializer else message.value
+                    handler(value)
                 except Exception as e:
                     logger.error(f"Error processing message from {topic}: {e}")
         
@@ -187,9 +287,15 @@ class CerberusEventBus:
             logger.error(f"Failed to subscribe to {topic}: {e}")
             raise
     
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every queued message has been sent (or failed)"""
+        if self.producer:
+            self.producer.flush(timeout=timeout)
+    
     def close(self):
         """Close all connections"""
         if self.producer:
+            self.flush()
             self.producer.close()
             logger.info("Producer closed")
         
@@ -5,15 +5,125 @@ Provides unified S3-compatible storage interface
 import os
 import io
 import json
+import asyncio
+import functools
 import hashlib
-from typing import Optional, Dict, List, BinaryIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional, Dict, Iterable, Iterator, List, BinaryIO, NamedTuple
 from datetime import datetime, timedelta
+import certifi
+import urllib3
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 import logging
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Multipart uploads (objects larger than one part) running at once, process-wide;
+# each one already fans out into MINIO_PARALLEL_PARTS threads
+_MULTIPART_SLOTS = threading.BoundedSemaphore(int(os.getenv("MINIO_MAX_MULTIPART_UPLOADS", "4")))
+
+# S3 multipart limits
+MAX_PARTS = 10000
+MAX_PART_SIZE = 5 << 30
+
+# Read size for single-stream downloads
+STREAM_CHUNK_SIZE = 1 << 20
+
+# upload_bytes(compress=True) stores zstd-compressed data marked with this user
+# metadata; this client's downloads decompress it transparently
+COMPRESSION_HEADER = "x-amz-meta-compression"
+ZSTD_LEVEL = int(os.getenv("MINIO_ZSTD_LEVEL", "3"))
+
+# ZstdCompressor instances are not thread-safe; keep one per thread
+_zstd_local = threading.local()
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(data)
+
+
+def _is_zstd(headers) -> bool:
+    """True if object headers mark it as stored zstd-compressed"""
+    if headers is None or headers.get(COMPRESSION_HEADER) != "zstd":
+        return False
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to download a zstd-compressed object")
+    return True
+
+
+def _build_http_client(maxsize: int) -> urllib3.PoolManager:
+    """
+    Keep-alive connection pool for the Minio client
+    
+    Minio's default pool keeps only 10 connections per host, fewer than
+    parallel part uploads and ranged GETs use at once. TLS settings match
+    the Minio default (SSL_CERT_FILE or certifi bundle).
+    """
+    return urllib3.PoolManager(
+        num_pools=16,
+        maxsize=maxsize,
+        block=False,
+        timeout=urllib3.Timeout(
+            connect=float(os.getenv("MINIO_CONNECT_TIMEOUT", "3")),
+            read=float(os.getenv("MINIO_READ_TIMEOUT", "60"))
+        ),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504]
+        )
+    )
+
+
+class ObjectInfo(NamedTuple):
+    """Listing entry yielded by CerberusStorageClient.iter_objects"""
+    name: str
+    size: Optional[int]
+    last_modified: Optional[datetime]
+    etag: Optional[str]
+
+
+# Fresh SHA256 contexts are cloned from this one; copy() skips digest init.
+# The template itself is never updated, so sharing it across threads is safe.
+_SHA256_TEMPLATE = hashlib.sha256()
+
+
+class _HashingReader:
+    """File wrapper that feeds SHA256 with every chunk MinIO reads for upload"""
+    __slots__ = ("_file", "digest")
+    
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self.digest = _SHA256_TEMPLATE.copy()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self.digest.update(data)
+        return data
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int):
+    """os.pwrite until all of ``data`` is written at ``offset``"""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
 
 class CerberusStorageClient:
     """
@@ -47,18 +157,50 @@ class CerberusStorageClient:
         self.secret_key = secret_key or os.getenv("MINIO_SECRET_KEY", "cerberus_minio_password")
         self.secure = secure or os.getenv("MINIO_SECURE", "false").lower() == "true"
         
+        # Multipart tuning: part size (>= 5 MiB) and parts uploaded concurrently
+        self.part_size = int(os.getenv("MINIO_PART_SIZE", str(64 << 20)))
+        self.num_parallel = int(os.getenv("MINIO_PARALLEL_PARTS", "4"))
+        
+        # Objects larger than one range are downloaded as concurrent ranged GETs
+        self.get_range_size = int(os.getenv("MINIO_GET_RANGE_SIZE", str(8 << 20)))
+        self.get_workers = int(os.getenv("MINIO_GET_WORKERS", "8"))
+        
+        # Enough keep-alive connections for concurrent part uploads and ranged GETs
+        pool_size = int(os.getenv(
+            "MINIO_HTTP_POOL_SIZE",
+            str(max(32, self.num_parallel * 4, self.get_workers))
+        ))
+        
         try:
             self.client = Minio(
                 self.endpoint,
                 access_key=self.access_key,
                 secret_key=self.secret_key,
-                secure=self.secure
+                secure=self.secure,
+                http_client=_build_http_client(pool_size)
             )
             logger.info(f"MinIO client initialized: {self.endpoint}")
         except Exception as e:
             logger.error(f"Failed to initialize MinIO client: {e}")
             raise
     
+    def _pick_part_size(self, size: int) -> int:
+        """
+        Part size for an upload of ``size`` bytes
+        
+        Objects up to MINIO_PART_SIZE go as a single PUT. Larger objects get
+        parts of at least that size, grown to the next power of two that keeps
+        the part count under S3's 10,000 limit (with headroom).
+        """
+        if size <= self.part_size:
+            return self.part_size
+        target = max(self.part_size, -(-size // (MAX_PARTS - 500)))
+        return min(MAX_PART_SIZE, 1 << (target - 1).bit_length())
+    
+    def _multipart_slot(self, size: int):
+        """Limit concurrent multipart uploads; single-part PUTs are not throttled"""
+        return _MULTIPART_SLOTS if size > self.part_size else nullcontext()
+    
     def ensure_bucket(self, bucket_name: str, retention_days: Optional[int] = None) -> bool:
         """
         Ensure bucket exists, create if not
@@ -106,22 +248,24 @@ class CerberusStorageClient:
             Dict with upload info (etag, size, checksum)
         """
         try:
-            # Calculate checksum
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-                checksum = hashlib.sha256(file_data).hexdigest()
-            
-            # Upload
-            result = self.client.fput_object(
-                bucket_name,
-                object_name,
-                file_path,
-                metadata=metadata or {}
-            )
-            
             file_size = os.path.getsize(file_path)
             
-            logger.info(f"Uploaded {object_name} to {bucket_name} ({file_size} bytes)")
+            # Upload, hashing during MinIO's own read of the file
+            part_size = self._pick_part_size(file_size)
+            with open(file_path, 'rb') as f, self._multipart_slot(file_size):
+                reader = _HashingReader(f)
+                result = self.client.put_object(
+                    bucket_name,
+                    object_name,
+                    reader,
+                    length=file_size,
+                    metadata=metadata or {},
+                    part_size=part_size,
+                    num_parallel_uploads=self.num_parallel
+                )
+            checksum = reader.digest.hexdigest()
+            
+            logger.info("Uploaded %s to %s (%d bytes)", object_name, bucket_name, file_size)
             
             return {
                 "bucket": bucket_name,
@@ -141,7 +285,8 @@ class CerberusStorageClient:
         object_name: str,
         data: bytes,
         content_type: str = "application/octet-stream",
-        metadata: Optional[Dict[str, str]] = None
+        metadata: Optional[Dict[str, str]] = None,
+        compress: bool = False
     ) -> Dict[str, str]:
         """
         Upload bytes directly to MinIO
@@ -152,30 +297,45 @@ class CerberusStorageClient:
             data: Bytes to upload
             content_type: MIME type
             metadata: Optional metadata
+            compress: Store zstd-compressed when zstandard is installed. Only
+                this client decompresses on read; presigned URLs and other
+                S3 readers get the compressed bytes.
             
         Returns:
-            Dict with upload info
+            Dict with upload info; size and checksum describe the uncompressed data
         """
         try:
-            checksum = hashlib.sha256(data).hexdigest()
-            data_stream = io.BytesIO(data)
+            digest = _SHA256_TEMPLATE.copy()
+            digest.update(data)
+            checksum = digest.hexdigest()
+            metadata = dict(metadata or {})
             
-            result = self.client.put_object(
-                bucket_name,
-                object_name,
-                data_stream,
-                length=len(data),
-                content_type=content_type,
-                metadata=metadata or {}
-            )
+            body = data
+            if compress and zstandard is not None:
+                body = _zstd_compress(data)
+                metadata["compression"] = "zstd"
             
-            logger.info(f"Uploaded {len(data)} bytes to {bucket_name}/{object_name}")
+            part_size = self._pick_part_size(len(body))
+            with self._multipart_slot(len(body)):
+                result = self.client.put_object(
+                    bucket_name,
+                    object_name,
+                    io.BytesIO(body),
+                    length=len(body),
+                    content_type=content_type,
+                    metadata=metadata,
+                    part_size=part_size,
+                    num_parallel_uploads=self.num_parallel
+                )
+            
+            logger.info("Uploaded %d bytes to %s/%s (%d stored)", len(data), bucket_name, object_name, len(body))
             
             return {
                 "bucket": bucket_name,
                 "object": object_name,
                 "etag": result.etag,
                 "size": len(data),
+                "stored_size": len(body),
                 "checksum": checksum,
                 "uploaded_at": datetime.utcnow().isoformat()
             }
@@ -188,7 +348,8 @@ class CerberusStorageClient:
         bucket_name: str,
         object_name: str,
         file_path: str,
-        validate_checksum: Optional[str] = None
+        validate_checksum: Optional[str] = None,
+        size: Optional[int] = None
     ) -> Dict[str, str]:
         """
         Download file from MinIO
@@ -198,40 +359,128 @@ class CerberusStorageClient:
             object_name: Object path
             file_path: Destination file path
             validate_checksum: Optional SHA256 to validate against
+            size: Stored object size, if already known (e.g. from iter_objects);
+                objects larger than MINIO_GET_RANGE_SIZE are then fetched as
+                parallel ranged GETs. Without it the object is streamed.
             
         Returns:
             Dict with download info
         """
         try:
-            self.client.fget_object(bucket_name, object_name, file_path)
-            
-            # Validate checksum if provided
-            if validate_checksum:
-                with open(file_path, 'rb') as f:
-                    actual_checksum = hashlib.sha256(f.read()).hexdigest()
-                    
-                if actual_checksum != validate_checksum:
+            if validate_checksum or size is None or size <= self.get_range_size:
+                # One streamed pass hashes while writing; the file is never read back
+                result = self.download_and_hash(
+                    bucket_name, object_name, file_path, chunk_size=STREAM_CHUNK_SIZE
+                )
+                actual_checksum = result.pop("checksum")
+                if validate_checksum and actual_checksum != validate_checksum:
                     raise ValueError(f"Checksum mismatch: expected {validate_checksum}, got {actual_checksum}")
+                return result
             
-            file_size = os.path.getsize(file_path)
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, size)
+                headers = self._parallel_get(
+                    bucket_name, object_name, size,
+                    lambda offset, chunk: _pwrite_all(fd, chunk, offset)
+                )
+            finally:
+                os.close(fd)
+            
+            if _is_zstd(headers):
+                # Ranges carry the stored (compressed) bytes; inflate in place
+                compressed_path = file_path + ".zst"
+                os.replace(file_path, compressed_path)
+                try:
+                    with open(compressed_path, 'rb') as src, open(file_path, 'wb') as dst:
+                        zstandard.ZstdDecompressor().copy_stream(src, dst)
+                finally:
+                    os.unlink(compressed_path)
+                size = os.path.getsize(file_path)
             
-            logger.info(f"Downloaded {bucket_name}/{object_name} to {file_path} ({file_size} bytes)")
+            logger.info("Downloaded %s/%s to %s (%d bytes)", bucket_name, object_name, file_path, size)
+            
+            return {
+                "bucket": bucket_name,
+                "object": object_name,
+                "local_path": file_path,
+                "size": size,
+                "downloaded_at": datetime.utcnow().isoformat()
+            }
+        except Exception as e:
+            logger.error(f"Failed to download {bucket_name}/{object_name}: {e}")
+            raise
+    
+    def download_and_hash(
+        self,
+        bucket_name: str,
+        object_name: str,
+        file_path: str,
+        chunk_size: int = 64 * 1024
+    ) -> Dict[str, str]:
+        """
+        Stream an object to a file, computing its SHA256 on the way
+        
+        Each chunk is hashed and written while it is still in cache, so the
+        file is never read back just to checksum it. Objects stored
+        zstd-compressed are decompressed on the way; size and checksum
+        describe the decompressed file.
+        
+        Args:
+            bucket_name: Source bucket
+            object_name: Object path
+            file_path: Destination file path
+            chunk_size: Bytes per read from the response stream
+            
+        Returns:
+            Dict with download info, including "checksum"
+        """
+        response = None
+        try:
+            response = self.client.get_object(bucket_name, object_name)
+            decompressor = (
+                zstandard.ZstdDecompressor().decompressobj()
+                if _is_zstd(response.headers) else None
+            )
+            digest = _SHA256_TEMPLATE.copy()
+            file_size = 0
+            
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                for chunk in response.stream(chunk_size):
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk)
+                    digest.update(chunk)
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(fd, view):]
+                    file_size += len(chunk)
+            finally:
+                os.close(fd)
+            
+            logger.info("Downloaded %s/%s to %s (%d bytes)", bucket_name, object_name, file_path, file_size)
             
             return {
                 "bucket": bucket_name,
                 "object": object_name,
                 "local_path": file_path,
                 "size": file_size,
+                "checksum": digest.hexdigest(),
                 "downloaded_at": datetime.utcnow().isoformat()
             }
         except Exception as e:
             logger.error(f"Failed to download {bucket_name}/{object_name}: {e}")
             raise
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
     
     def download_bytes(
         self,
         bucket_name: str,
-        object_name: str
+        object_name: str,
+        size: Optional[int] = None
     ) -> bytes:
         """
         Download object as bytes
@@ -239,22 +488,93 @@ class CerberusStorageClient:
         Args:
             bucket_name: Source bucket
             object_name: Object path
+            size: Stored object size, if already known (e.g. from iter_objects);
+                objects larger than MINIO_GET_RANGE_SIZE are then fetched as
+                parallel ranged GETs. Without it a single GET is used.
             
         Returns:
-            Object data as bytes
+            Object data as bytes (decompressed if stored zstd-compressed)
         """
         try:
-            response = self.client.get_object(bucket_name, object_name)
-            data = response.read()
-            response.close()
-            response.release_conn()
+            if size is not None and size > self.get_range_size:
+                buffer = bytearray(size)
+                
+                def write(offset: int, chunk: bytes):
+                    buffer[offset:offset + len(chunk)] = chunk
+                
+                headers = self._parallel_get(bucket_name, object_name, size, write)
+                data = bytes(buffer)
+            else:
+                response = self.client.get_object(bucket_name, object_name)
+                headers = response.headers
+                data = response.read()
+                response.close()
+                response.release_conn()
+            
+            if _is_zstd(headers):
+                data = zstandard.ZstdDecompressor().decompress(data)
             
-            logger.info(f"Downloaded {len(data)} bytes from {bucket_name}/{object_name}")
+            logger.info("Downloaded %d bytes from %s/%s", len(data), bucket_name, object_name)
             return data
         except Exception as e:
             logger.error(f"Failed to download bytes from {bucket_name}/{object_name}: {e}")
             raise
     
+    def _parallel_get(self, bucket_name: str, object_name: str, size: int, write):
+        """
+        Fetch an object as concurrent ranged GETs
+        
+        Args:
+            bucket_name: Source bucket
+            object_name: Object path
+            size: Object size in bytes
+            write: Called as write(offset, data) for each range, from worker threads
+            
+        Returns:
+            Response headers of the first range (object metadata)
+        """
+        ranges = [
+            (offset, min(self.get_range_size, size - offset))
+            for offset in range(0, size, self.get_range_size)
+        ]
+        
+        def fetch(byte_range):
+            offset, length = byte_range
+            response = self.client.get_object(bucket_name, object_name, offset=offset, length=length)
+            try:
+                write(offset, response.read())
+                return response.headers
+            finally:
+                response.close()
+                response.release_conn()
+        
+        with ThreadPoolExecutor(max_workers=min(self.get_workers, len(ranges))) as executor:
+            # list() consumes every result, so the first failed range raises here
+            return list(executor.map(fetch, ranges))[0]
+    
+    def iter_objects(
+        self,
+        bucket_name: str,
+        prefix: Optional[str] = None,
+        recursive: bool = False
+    ) -> Iterator[ObjectInfo]:
+        """
+        Lazily iterate objects in bucket
+        
+        Listing pages are fetched as the iterator advances, so large buckets
+        are never held in memory at once.
+        
+        Args:
+            bucket_name: Bucket to list
+            prefix: Optional prefix filter
+            recursive: List recursively
+            
+        Yields:
+            ObjectInfo per object
+        """
+        for obj in self.client.list_objects(bucket_name, prefix=prefix, recursive=recursive):
+            yield ObjectInfo(obj.object_name, obj.size, obj.last_modified, obj.etag)
+    
     def list_objects(
         self,
         bucket_name: str,
@@ -264,6 +584,8 @@ class CerberusStorageClient:
         """
         List objects in bucket
         
+        Prefer iter_objects for large buckets.
+        
         Args:
             bucket_name: Bucket to list
             prefix: Optional prefix filter
@@ -273,22 +595,17 @@ class CerberusStorageClient:
             List of object info dicts
         """
         try:
-            objects = self.client.list_objects(
-                bucket_name,
-                prefix=prefix,
-                recursive=recursive
-            )
-            
-            result = []
-            for obj in objects:
-                result.append({
-                    "name": obj.object_name,
+            result = [
+                {
+                    "name": obj.name,
                     "size": obj.size,
                     "last_modified": obj.last_modified.isoformat() if obj.last_modified else None,
                     "etag": obj.etag
-                })
+                }
+                for obj in self.iter_objects(bucket_name, prefix=prefix, recursive=recursive)
+            ]
             
-            logger.info(f"Listed {len(result)} objects from {bucket_name} (prefix={prefix})")
+            logger.info("Listed %d objects from %s (prefix=%s)", len(result), bucket_name, prefix)
             return result
         except Exception as e:
             logger.error(f"Failed to list objects from {bucket_name}: {e}")
@@ -307,12 +624,36 @@ class CerberusStorageClient:
         """
         try:
             self.client.remove_object(bucket_name, object_name)
-            logger.info(f"Deleted {bucket_name}/{object_name}")
+            logger.info("Deleted %s/%s", bucket_name, object_name)
             return True
         except Exception as e:
             logger.error(f"Failed to delete {bucket_name}/{object_name}: {e}")
             return False
     
+    def delete_objects(self, bucket_name: str, object_names: Iterable[str]) -> List[str]:
+        """
+        Delete many objects with multi-object DELETE requests
+        
+        MinIO sends up to 1000 keys per request, so sweeping thousands of
+        objects costs a handful of round-trips instead of one per object.
+        
+        Args:
+            bucket_name: Source bucket
+            object_names: Objects to delete (consumed lazily)
+            
+        Returns:
+            Names of objects that could not be deleted
+        """
+        failed = []
+        for error in self.client.remove_objects(
+            bucket_name, (DeleteObject(name) for name in object_names)
+        ):
+            logger.error(f"Failed to delete {bucket_name}/{error.name}: {error.code} {error.message}")
+            failed.append(error.name)
+        
+        logger.info("Bulk delete in %s finished (%d failed)", bucket_name, len(failed))
+        return failed
+    
     def get_presigned_url(
         self,
         bucket_name: str,
@@ -336,20 +677,83 @@ class CerberusStorageClient:
                 object_name,
                 expires=expires
             )
-            logger.info(f"Generated presigned URL for {bucket_name}/{object_name} (expires in {expires})")
+            logger.info("Generated presigned URL for %s/%s (expires in %s)", bucket_name, object_name, expires)
             return url
         except Exception as e:
             logger.error(f"Failed to generate presigned URL: {e}")
             raise
 
 
+class AsyncCerberusStorageClient:
+    """
+    asyncio interface to CerberusStorageClient
+    
+    Each call runs the blocking client on a dedicated thread pool instead of
+    the loop's default executor, so many uploads/downloads can be in flight
+    at once without starving other run_in_executor users. The pool size
+    defaults to the MinIO HTTP connection pool size (MINIO_ASYNC_WORKERS).
+    """
+    
+    def __init__(
+        self,
+        client: Optional[CerberusStorageClient] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.client = client or get_storage_client()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("MINIO_ASYNC_WORKERS", "32")),
+            thread_name_prefix="minio-async"
+        )
+    
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+    
+    async def ensure_bucket(self, *args, **kwargs) -> bool:
+        return await self._run(self.client.ensure_bucket, *args, **kwargs)
+    
+    async def upload_file(self, *args, **kwargs) -> Dict[str, str]:
+        return await self._run(self.client.upload_file, *args, **kwargs)
+    
+    async def upload_bytes(self, *args, **kwargs) -> Dict[str, str]:
+        return await self._run(self.client.upload_bytes, *args, **kwargs)
+    
+    async def download_file(self, *args, **kwargs) -> Dict[str, str]:
+        return await self._run(self.client.download_file, *args, **kwargs)
+    
+    async def download_and_hash(self, *args, **kwargs) -> Dict[str, str]:
+        return await self._run(self.client.download_and_hash, *args, **kwargs)
+    
+    async def download_bytes(self, *args, **kwargs) -> bytes:
+        return await self._run(self.client.download_bytes, *args, **kwargs)
+    
+    async def list_objects(self, *args, **kwargs) -> List[Dict[str, any]]:
+        return await self._run(self.client.list_objects, *args, **kwargs)
+    
+    async def delete_object(self, *args, **kwargs) -> bool:
+        return await self._run(self.client.delete_object, *args, **kwargs)
+    
+    async def delete_objects(self, *args, **kwargs) -> List[str]:
+        return await self._run(self.client.delete_objects, *args, **kwargs)
+    
+    async def get_presigned_url(self, *args, **kwargs) -> str:
+        return await self._run(self.client.get_presigned_url, *args, **kwargs)
+    
+    def close(self):
+        """Shut down the worker pool (in-flight calls finish first)"""
+        self._executor.shutdown(wait=True)
+
+
 # Singleton instance
 _storage_client: Optional[CerberusStorageClient] = None
+_storage_client_lock = threading.Lock()
 
 
 def get_storage_client() -> CerberusStorageClient:
-    """Get singleton storage client instance"""
+    """Get singleton storage client instance (one connection pool per process)"""
     global _storage_client
     if _storage_client is None:
-        _storage_client = CerberusStorageClient()
+        with _storage_client_lock:
+            if _storage_client is None:
+                _storage_client = CerberusStorageClient()
     return _storage_client
@@ -103,3 +103,59 @@ cerberus_db_operations_total = Counter(
     'Database operations by Cerberus',
     ['db', 'operation']
 )
+
+# Evidence package metrics
+evidence_packages_created = Counter(
+    'cerberus_evidence_packages_created_total',
+    'Total evidence packages built and uploaded',
+    ['service']
+)
+
+evidence_har_entries = Histogram(
+    'cerberus_evidence_har_entries',
+    'HAR entries per evidence package',
+    ['service'],
+    buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000]
+)
+
+evidence_payload_count = Histogram(
+    'cerberus_evidence_payload_count',
+    'Payloads per evidence package',
+    ['service'],
+    buckets=[0, 1, 2, 5, 10, 25, 50, 100]
+)
+
+evidence_package_size_bytes = Histogram(
+    'cerberus_evidence_package_size_bytes',
+    'Stored size of evidence packages in bytes',
+    ['service'],
+    buckets=[1024, 10240, 102400, 1048576, 10485760, 104857600]
+)
+
+evidence_upload_duration_seconds = Histogram(
+    'cerberus_evidence_upload_duration_seconds',
+    'Evidence package upload duration in seconds',
+    ['service']
+)
+
+payloads_extracted = Counter(
+    'cerberus_payloads_extracted_total',
+    'Total payloads extracted into evidence packages',
+    ['service', 'payload_type']
+)
+
+storage_operations = Counter(
+    'cerberus_storage_operations_total',
+    'Object storage operations',
+    ['service', 'operation', 'status']
+)
+
+
+def record_evidence_creation(service: str, har_entries: int, payload_count: int,
+                             package_size: int, upload_duration: float):
+    """Record metrics for one completed evidence package"""
+    evidence_packages_created.labels(service=service).inc()
+    evidence_har_entries.labels(service=service).observe(har_entries)
+    evidence_payload_count.labels(service=service).observe(payload_count)
+    evidence_package_size_bytes.labels(service=service).observe(package_size)
+    evidence_upload_duration_seconds.labels(service=service).observe(upload_duration)
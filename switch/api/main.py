@@ -5,11 +5,12 @@ Manages session pinning and routing between production and Labyrinth
 from fastapi import FastAPI, HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from typing import Dict, List, Literal, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Literal, NamedTuple, Optional
+from datetime import datetime, timedelta, timezone
 import hashlib
 import sys
 import os
+import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from shared.events.schemas import SessionPinnedEvent
@@ -22,8 +23,20 @@ app = FastAPI(
 
 security = HTTPBearer()
 
+
+class PinRecord(NamedTuple):
+    """Stored pin; expiry is kept as epoch seconds so routing never parses dates"""
+    session_id: str
+    fingerprint: str
+    pinned_at: str
+    pinned_until: str
+    pinned_until_ts: float
+    reason: str
+    metadata: Dict
+
+
 # Session pin storage (in production: use Redis with TTL)
-pinned_sessions: Dict[str, Dict] = {}
+pinned_sessions: Dict[str, PinRecord] = {}
 
 # Configuration
 PIN_DURATION_HOURS = 24
@@ -102,18 +115,19 @@ async def pin_session(
     fingerprint = generate_fingerprint(req.session_id, req.client_ip)
     
     # Calculate expiration
-    pinned_until = datetime.utcnow() + timedelta(hours=req.duration_hours)
+    pinned_at = datetime.utcnow()
+    pinned_until = pinned_at + timedelta(hours=req.duration_hours)
     
     # Store pin
-    pinned_sessions[fingerprint] = {
-        "session_id": req.session_id,
-        "fingerprint": fingerprint,
-        "target": "labyrinth",
-        "pinned_at": datetime.utcnow().isoformat(),
-        "pinned_until": pinned_until.isoformat(),
-        "reason": req.reason,
-        "metadata": req.metadata
-    }
+    pinned_sessions[fingerprint] = PinRecord(
+        session_id=req.session_id,
+        fingerprint=fingerprint,
+        pinned_at=pinned_at.isoformat(),
+        pinned_until=pinned_until.isoformat(),
+        pinned_until_ts=pinned_until.replace(tzinfo=timezone.utc).timestamp(),
+        reason=req.reason,
+        metadata=req.metadata
+    )
     
     # Emit event
     event = SessionPinnedEvent(
@@ -151,14 +165,12 @@ async def get_route(req: RouteRequest):
     fingerprint = _extract_fingerprint(req)
     
     # Check if session is pinned
-    if fingerprint in pinned_sessions:
-        pin_info = pinned_sessions[fingerprint]
-        
+    pin_info = pinned_sessions.get(fingerprint)
+    if pin_info is not None:
         # Check if pin has expired
-        pinned_until = datetime.fromisoformat(pin_info["pinned_until"])
-        if datetime.utcnow() > pinned_until:
+        if time.time() > pin_info.pinned_until_ts:
             # Pin expired, remove it
-            del pinned_sessions[fingerprint]
+            pinned_sessions.pop(fingerprint, None)
             print(f"[SWITCH] Pin expired: {fingerprint}")
         else:
             # Route to Labyrinth
@@ -186,19 +198,18 @@ async def get_route(req: RouteRequest):
 async def list_sessions():
     """List all pinned sessions"""
     sessions = []
-    now = datetime.utcnow()
+    now = time.time()
     
     # Clean expired sessions
     expired = []
     for fingerprint, info in pinned_sessions.items():
-        pinned_until = datetime.fromisoformat(info["pinned_until"])
-        if now > pinned_until:
+        if now > info.pinned_until_ts:
             expired.append(fingerprint)
         else:
-            sessions.append(SessionInfo(**info))
+            sessions.append(_session_info(info))
     
     for fp in expired:
-        del pinned_sessions[fp]
+        pinned_sessions.pop(fp, None)
     
     return sessions
 
@@ -207,8 +218,8 @@ async def list_sessions():
 async def get_session(session_id: str):
     """Get info about a specific session"""
     for info in pinned_sessions.values():
-        if info["session_id"] == session_id:
-            return SessionInfo(**info)
+        if info.session_id == session_id:
+            return _session_info(info)
     
     raise HTTPException(status_code=404, detail="Session not found")
 
@@ -224,8 +235,8 @@ async def unpin_session(
     # Find and remove pin
     removed = False
     for fingerprint, info in list(pinned_sessions.items()):
-        if info["session_id"] == session_id:
-            del pinned_sessions[fingerprint]
+        if info.session_id == session_id:
+            pinned_sessions.pop(fingerprint, None)
             removed = True
             print(f"[SWITCH] Session unpinned: {session_id}")
     
@@ -238,9 +249,8 @@ async def unpin_session(
 @app.get("/api/v1/switch/stats")
 async def get_stats():
     """Get Switch statistics"""
-    now = datetime.utcnow()
-    active = sum(1 for info in pinned_sessions.values() 
-                 if datetime.fromisoformat(info["pinned_until"]) > now)
+    now = time.time()
+    active = sum(1 for info in pinned_sessions.values() if info.pinned_until_ts > now)
     
     return {
         "total_pinned": len(pinned_sessions),
@@ -252,6 +262,19 @@ async def get_stats():
 
 # Helper functions
 
+def _session_info(record: PinRecord) -> SessionInfo:
+    """API view of a stored pin"""
+    return SessionInfo(
+        session_id=record.session_id,
+        fingerprint=record.fingerprint,
+        target="labyrinth",
+        pinned_at=record.pinned_at,
+        pinned_until=record.pinned_until,
+        reason=record.reason,
+        metadata=record.metadata
+    )
+
+
 def generate_fingerprint(session_id: str, client_ip: str) -> str:
     """Generate consistent fingerprint for session"""
     data = f"{session_id}:{client_ip}"
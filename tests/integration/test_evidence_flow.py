@@ -2,6 +2,7 @@
 Integration Test for Evidence Flow
 Tests complete evidence collection → storage → retrieval → analysis pipeline
 """
+import hashlib
 import pytest
 import time
 import tempfile
@@ -14,6 +15,16 @@ from shared.evidence.retriever import EvidenceRetriever
 from shared.evidence.models import EvidencePointer, BehaviorProfile, TTPs
 
 
+def _download_and_hash(download):
+    """Adapt a download_file stub to the streaming download_and_hash API"""
+    def wrapper(bucket, obj_name, local_path):
+        download(bucket, obj_name, local_path)
+        with open(local_path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        return {"object": obj_name, "local_path": local_path, "checksum": checksum}
+    return wrapper
+
+
 class TestEvidenceFlow:
     """
     Integration tests for complete evidence workflow
@@ -27,7 +38,7 @@ class TestEvidenceFlow:
         with patch('shared.evidence.builder.get_storage_client') as mock_get_client:
             mock_client = MagicMock()
             mock_client.ensure_bucket.return_value = True
-            mock_client.upload_file.return_value = {
+            mock_client.upload_bytes.return_value = {
                 "bucket": "test-evidence",
                 "object": "test/file.har",
                 "etag": "abc123",
@@ -90,7 +101,7 @@ class TestEvidenceFlow:
         
         # Verify storage calls
         mock_storage.ensure_bucket.assert_called()
-        assert mock_storage.upload_file.call_count >= 1
+        assert mock_storage.upload_bytes.call_count >= 1
     
     def test_evidence_retriever_downloads_package(self, mock_storage):
         """Test that retriever can download and parse evidence"""
@@ -106,7 +117,7 @@ class TestEvidenceFlow:
                 with open(local_path, 'w') as f:
                     f.write('{"event_id": "evt_test", "session_metadata": {}}')
         
-        mock_storage.download_file.side_effect = mock_download
+        mock_storage.download_and_hash.side_effect = _download_and_hash(mock_download)
         
         # Create pointer
         pointer = EvidencePointer(
@@ -220,7 +231,7 @@ class TestEvidenceFlow:
                 with open(local_path, 'w') as f:
                     f.write('{"intent": "reconnaissance", "sophistication_score": 6.5}')
         
-        mock_storage.download_file.side_effect = mock_download_full
+        mock_storage.download_and_hash.side_effect = _download_and_hash(mock_download_full)
         mock_storage.list_objects.return_value = [
             {"name": "evt_pipeline_test/session.har", "size": 2048},
             {"name": "evt_pipeline_test/metadata.json", "size": 512},
@@ -3,6 +3,7 @@ Unit tests for Authentication System
 """
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from shared.auth.jwt_handler import (
     create_access_token,
@@ -15,6 +16,8 @@ from shared.auth.jwt_handler import (
     verify_api_key,
     get_service_token,
     verify_service_api_key,
+    clear_token_cache,
+    TokenClaims,
     TokenData
 )
 
@@ -58,6 +61,50 @@ class TestJWTHandler:
         token_data = decode_token(invalid_token)
         assert token_data is None
     
+    def test_decode_token_is_cached(self):
+        """Test repeat decodes of the same token skip signature verification"""
+        clear_token_cache()
+        token = create_access_token(
+            data={"username": "cached", "service": "switch", "roles": []}
+        )
+        decode_token(token)
+        
+        with patch("shared.auth.jwt_handler._jwt.decode") as mock_decode:
+            token_data = decode_token(token)
+        
+        mock_decode.assert_not_called()
+        assert token_data.username == "cached"
+    
+    def test_cached_roles_not_shared(self):
+        """Test mutating a decoded token's roles does not leak into cache hits"""
+        clear_token_cache()
+        token = create_access_token(
+            data={"username": "cached", "service": "switch", "roles": ["analyst"]}
+        )
+        
+        decode_token(token).roles.append("admin")
+        
+        assert decode_token(token).roles == ["analyst"]
+    
+    def test_token_without_service_rejected(self):
+        """Test a token with no service claim is rejected instead of raising"""
+        clear_token_cache()
+        token = create_access_token(data={"username": "legacy", "roles": []})
+        
+        assert decode_token(token) is None
+        assert not verify_token(token)
+    
+    def test_expired_token_not_served_from_cache(self):
+        """Test cache entries never outlive the token's own expiry"""
+        clear_token_cache()
+        token = create_access_token(
+            data={"username": "short", "service": "switch", "roles": []},
+            expires_delta=timedelta(seconds=-1)
+        )
+        
+        assert decode_token(token) is None
+        assert decode_token(token) is None
+    
     def test_verify_token_with_service(self):
         """Test token verification with service requirement"""
         token = create_access_token(
@@ -149,6 +196,14 @@ class TestAPIKeys:
         
         wrong_key = create_api_key("test", "test")  # Different key
         assert verify_api_key(wrong_key, hashed_key) == False
+    
+    def test_verify_legacy_bcrypt_api_key(self):
+        """Test API keys hashed with bcrypt still verify"""
+        api_key = create_api_key("test", "test")
+        legacy_hash = get_password_hash(api_key)
+        
+        assert verify_api_key(api_key, legacy_hash) == True
+        assert verify_api_key("wrong", legacy_hash) == False
 
 
 class TestServiceAccounts:
@@ -223,6 +278,22 @@ class TestTokenData:
         
         assert token_data.exp == exp_time
 
+    
+    def test_decoded_claims_convert_to_model(self):
+        """Test decode_token claims convert to the pydantic model"""
+        token = create_access_token(
+            data={"username": "test", "service": "sentinel", "roles": ["analyst"]}
+        )
+        
+        claims = decode_token(token)
+        assert isinstance(claims, TokenClaims)
+        
+        token_data = claims.to_model()
+        assert isinstance(token_data, TokenData)
+        assert token_data.username == "test"
+        assert token_data.roles == ["analyst"]
+        assert token_data.exp is not None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
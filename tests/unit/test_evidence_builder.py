@@ -2,6 +2,7 @@
 Unit tests for Evidence Builder
 """
 import pytest
+import hashlib
 import os
 import tempfile
 import shutil
@@ -29,18 +30,13 @@ class TestEvidenceBuilder:
             user_agent=self.user_agent
         )
     
-    def teardown_method(self):
-        """Cleanup after tests"""
-        if hasattr(self.builder, 'workspace') and os.path.exists(self.builder.workspace):
-            shutil.rmtree(self.builder.workspace, ignore_errors=True)
-    
     def test_initialization(self):
         """Test builder initialization"""
         assert self.builder.event_id == self.event_id
         assert self.builder.session_id == self.session_id
         assert self.builder.attacker_ip == self.attacker_ip
         assert self.builder.user_agent == self.user_agent
-        assert os.path.exists(self.builder.workspace)
+        assert self.builder.artifact_files == {}
         assert len(self.builder.har_entries) == 0
         assert len(self.builder.payloads) == 0
     
@@ -85,7 +81,29 @@ class TestEvidenceBuilder:
         assert payload.payload_type == "sql_injection"
         assert payload.payload_value == "1' OR '1'='1"
         assert payload.confidence == 0.95
-        assert payload.checksum is not None
+    
+    @patch('shared.evidence.builder.get_storage_client')
+    def test_payload_checksums_filled_at_build(self, mock_storage_client):
+        """Test payload checksums are computed when the package is built"""
+        mock_storage = MagicMock()
+        mock_storage.upload_bytes.return_value = {"object": "test", "size": 1, "checksum": "abc"}
+        mock_storage_client.return_value = mock_storage
+        values = ["1' OR '1'='1", "x" * 100_000]
+        for value in values:
+            self.builder.add_payload(
+                payload_type="sql_injection",
+                payload_value=value,
+                location="query.id",
+                confidence=0.9
+            )
+        
+        assert self.builder.payloads[0].checksum is None
+        
+        self.builder.build_and_upload()
+        
+        assert [p.checksum for p in self.builder.payloads] == [
+            hashlib.sha256(v.encode()).hexdigest() for v in values
+        ]
     
     def test_add_payload_with_file(self):
         """Test adding payload saved as file"""
@@ -102,14 +120,8 @@ class TestEvidenceBuilder:
         payload = self.builder.payloads[0]
         assert payload.file_path is not None
         
-        # Verify file was created
-        full_path = os.path.join(self.builder.workspace, payload.file_path)
-        assert os.path.exists(full_path)
-        
-        # Verify content
-        with open(full_path, 'r') as f:
-            content = f.read()
-            assert content == large_payload
+        # Verify content is kept as a package artifact
+        assert self.builder.artifact_files[payload.file_path] == large_payload.encode()
     
     def test_add_tag(self):
         """Test adding tags"""
@@ -124,15 +136,19 @@ class TestEvidenceBuilder:
     def test_add_uploaded_file(self):
         """Test tracking uploaded malicious file"""
         # Create test file
-        test_file = os.path.join(self.builder.workspace, "malicious.txt")
+        upload_dir = tempfile.mkdtemp()
+        test_file = os.path.join(upload_dir, "malicious.txt")
         with open(test_file, 'w') as f:
             f.write("malicious content")
         
-        self.builder.add_uploaded_file(
-            filename="malicious.txt",
-            file_path=test_file,
-            file_size=len("malicious content")
-        )
+        try:
+            self.builder.add_uploaded_file(
+                filename="malicious.txt",
+                file_path=test_file,
+                file_size=len("malicious content")
+            )
+        finally:
+            shutil.rmtree(upload_dir, ignore_errors=True)
         
         assert len(self.builder.uploaded_files) == 1
         file_info = self.builder.uploaded_files[0]
@@ -145,7 +161,7 @@ class TestEvidenceBuilder:
         # Setup mock storage client
         mock_storage = MagicMock()
         mock_storage.ensure_bucket.return_value = True
-        mock_storage.upload_file.return_value = {
+        mock_storage.upload_bytes.return_value = {
             "bucket": "labyrinth-evidence",
             "object": "evt_test_001/session.har",
             "etag": "abc123",
@@ -188,14 +204,14 @@ class TestEvidenceBuilder:
         
         # Verify storage calls
         mock_storage.ensure_bucket.assert_called_once()
-        assert mock_storage.upload_file.call_count >= 1
+        assert mock_storage.upload_bytes.call_count >= 1
     
     @patch('shared.evidence.builder.get_storage_client')
     def test_build_with_behavior_profile(self, mock_storage_client):
         """Test building with behavioral profile"""
         mock_storage = MagicMock()
         mock_storage.ensure_bucket.return_value = True
-        mock_storage.upload_file.return_value = {
+        mock_storage.upload_bytes.return_value = {
             "bucket": "test",
             "object": "test",
             "etag": "test",
@@ -237,49 +253,63 @@ class TestEvidenceBuilder:
         assert pointer is not None
         
         # Verify behavior.json was created (check upload calls)
-        upload_calls = [call[0] for call in mock_storage.upload_file.call_args_list]
+        upload_calls = [call[0] for call in mock_storage.upload_bytes.call_args_list]
         object_names = [call[1] for call in upload_calls]
         
         # Should have uploaded metadata.json, session.har, and behavior.json
         assert any("behavior.json" in name for name in object_names)
     
-    def test_workspace_cleanup_after_upload(self):
-        """Test that workspace is cleaned up after successful upload"""
-        # Store workspace path
-        workspace_path = self.builder.workspace
-        assert os.path.exists(workspace_path)
+    @patch('shared.evidence.builder.get_storage_client')
+    def test_package_checksum_uses_object_order(self, mock_storage_client):
+        """Test package checksum is independent of upload completion order"""
+        mock_storage = MagicMock()
+        mock_storage.upload_bytes.side_effect = lambda bucket, name, data, content_type, compress=False: {
+            "object": name,
+            "size": 1,
+            "checksum": name.rsplit("/", 1)[-1]
+        }
+        mock_storage_client.return_value = mock_storage
         
-        with patch('shared.evidence.builder.get_storage_client') as mock_storage_client:
-            mock_storage = MagicMock()
-            mock_storage.ensure_bucket.return_value = True
-            mock_storage.upload_file.return_value = {
-                "bucket": "test",
-                "object": "test",
-                "etag": "test",
-                "size": 100,
-                "checksum": "abc",
-                "uploaded_at": datetime.utcnow().isoformat()
-            }
-            mock_storage_client.return_value = mock_storage
-            
-            # Add minimal data and upload
-            self.builder.add_har_entry(
-                method="GET",
-                url="/",
-                request_headers={},
-                request_body="",
-                response_status=200,
-                response_headers={},
-                response_body="",
-                start_time=datetime.utcnow(),
-                duration_ms=10
-            )
-            
-            pointer = self.builder.build_and_upload()
-            
-            # Workspace should be cleaned up
-            assert not os.path.exists(workspace_path)
-
+        pointer = self.builder.build_and_upload()
+        
+        expected = hashlib.sha256("metadata.jsonsession.har".encode()).hexdigest()
+        assert pointer.checksum == expected
+    
+    @patch('shared.evidence.builder.get_storage_client')
+    def test_archive_mode_uploads_single_object(self, mock_storage_client):
+        """Test archive mode packs the workspace into one upload"""
+        mock_storage = MagicMock()
+        mock_storage.upload_bytes.return_value = {"object": "archive", "size": 10, "checksum": "abc"}
+        mock_storage_client.return_value = mock_storage
+        
+        pointer = self.builder.build_and_upload(archive=True)
+        
+        mock_storage.upload_bytes.assert_called_once()
+        object_name = mock_storage.upload_bytes.call_args.args[1]
+        assert object_name.startswith(f"{self.event_id}/evidence.tar")
+        assert pointer.checksum == hashlib.sha256(b"abc").hexdigest()
+    
+    @patch('shared.evidence.builder.get_storage_client')
+    def test_artifacts_uploaded_from_memory(self, mock_storage_client):
+        """Test artifacts are uploaded as bytes without touching disk"""
+        mock_storage = MagicMock()
+        mock_storage.upload_bytes.return_value = {"object": "test", "size": 10, "checksum": "abc"}
+        mock_storage_client.return_value = mock_storage
+        
+        self.builder.add_payload(
+            payload_type="xss",
+            payload_value="<script>alert(1)</script>",
+            location="query.q",
+            confidence=0.9,
+            save_as_file=True
+        )
+        
+        self.builder.build_and_upload()
+        
+        uploads = {call.args[1]: call.args[2] for call in mock_storage.upload_bytes.call_args_list}
+        assert uploads[f"{self.event_id}/payloads/payload_000.txt"] == b"<script>alert(1)</script>"
+        assert f"{self.event_id}/session.har" in uploads
+        mock_storage.upload_file.assert_not_called()
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
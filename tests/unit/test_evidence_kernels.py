@@ -0,0 +1,116 @@
+"""
+Unit tests for Evidence Columnar Views and Analysis Kernels
+"""
+import math
+import pytest
+
+from shared.evidence.columnar import HTTP_METHODS
+from shared.evidence.kernels import har_stats
+from shared.evidence.models import HARLog, HARLogEntry
+
+
+def _entry(method="GET", status=200, started="2024-01-01T00:00:00", time=10.0, url="http://t/a"):
+    response = {"status": status} if status is not None else {}
+    return HARLogEntry(
+        startedDateTime=started,
+        time=time,
+        request={"method": method, "url": url},
+        response=response
+    )
+
+
+class TestHARColumnar:
+    """Test suite for the column-wise HAR view"""
+
+    def test_columns_follow_entries(self):
+        """Test row i of each column describes entry i"""
+        columns = HARLog(entries=[
+            _entry(),
+            _entry(method="POST", status=404, time=2.5, url="http://t/b"),
+            _entry(url="http://t/a")
+        ]).to_columnar()
+
+        assert len(columns) == 3
+        assert columns.durations.tolist() == [10.0, 2.5, 10.0]
+        assert columns.statuses.tolist() == [200, 404, 200]
+        assert [HTTP_METHODS[m] for m in columns.methods] == ["GET", "POST", "GET"]
+        assert columns.urls == ["http://t/a", "http://t/b"]
+        assert columns.url_ids.tolist() == [0, 1, 0]
+
+    def test_unknown_method_maps_to_other(self):
+        """Test verbs outside HTTP_METHODS fall back to OTHER"""
+        columns = HARLog(entries=[_entry(method="PROPFIND")]).to_columnar()
+
+        assert HTTP_METHODS[columns.methods[0]] == "OTHER"
+
+    def test_missing_status_maps_to_zero(self):
+        """Test a response without a status is recorded as 0"""
+        columns = HARLog(entries=[_entry(status=None)]).to_columnar()
+
+        assert columns.statuses.tolist() == [0]
+
+    def test_unparseable_timestamp_is_nan(self):
+        """Test a bad startedDateTime becomes NaN instead of raising"""
+        columns = HARLog(entries=[
+            _entry(started="not a timestamp"),
+            _entry(started="2024-01-01T00:00:00+00:00")
+        ]).to_columnar()
+
+        assert math.isnan(columns.start_times[0])
+        assert columns.start_times[1] == 1704067200.0
+
+    def test_empty_log(self):
+        """Test an empty HAR log yields empty columns"""
+        columns = HARLog().to_columnar()
+
+        assert len(columns) == 0
+        assert columns.urls == []
+        assert columns.statuses.size == 0
+
+
+class TestHARStats:
+    """Test suite for HAR summary statistics"""
+
+    def test_stats_summarize_log(self):
+        """Test totals, mean and per-class counts"""
+        columns = HARLog(entries=[
+            _entry(status=200, time=10.0),
+            _entry(status=302, time=20.0),
+            _entry(status=500, time=30.0)
+        ]).to_columnar()
+
+        stats = har_stats(columns)
+
+        assert stats["request_count"] == 3
+        assert stats["total_time_ms"] == 60.0
+        assert stats["mean_time_ms"] == 20.0
+        assert stats["status_classes"] == {"2xx": 1, "3xx": 1, "5xx": 1}
+
+    def test_status_above_599_in_last_bucket(self):
+        """Test non-standard statuses >= 600 fold into the last class"""
+        columns = HARLog(entries=[
+            _entry(status=599), _entry(status=600), _entry(status=999)
+        ]).to_columnar()
+
+        assert har_stats(columns)["status_classes"] == {"5xx": 3}
+
+    def test_missing_status_counted_as_0xx(self):
+        """Test entries without a status land in the 0xx class"""
+        columns = HARLog(entries=[_entry(status=None)]).to_columnar()
+
+        assert har_stats(columns)["status_classes"] == {"0xx": 1}
+
+    def test_empty_log(self):
+        """Test an empty log reports zeros instead of dividing by zero"""
+        stats = har_stats(HARLog().to_columnar())
+
+        assert stats == {
+            "request_count": 0,
+            "total_time_ms": 0.0,
+            "mean_time_ms": 0.0,
+            "status_classes": {}
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
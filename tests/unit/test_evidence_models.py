@@ -0,0 +1,60 @@
+"""
+Unit tests for Evidence Models
+"""
+import pytest
+from pydantic import ValidationError
+
+from shared.evidence.models import (
+    EvidenceMetadata, EvidencePackage, HARLog, PayloadArtifact, SessionMetadata
+)
+
+
+class TestEvidencePackage:
+    """Test suite for the frozen evidence package"""
+
+    def setup_method(self):
+        """Setup a package with one payload"""
+        session = SessionMetadata(
+            session_id="sess_001",
+            attacker_ip="203.0.113.42",
+            user_agent="sqlmap/1.5.2",
+            fingerprint="fp",
+            session_start="2024-01-01T00:00:00",
+            session_end="2024-01-01T00:01:00",
+            request_count=1,
+            total_duration_ms=60000
+        )
+        self.package = EvidencePackage(
+            metadata=EvidenceMetadata(
+                event_id="evt_001",
+                session_metadata=session,
+                storage_location="s3://cerberus-evidence/evt_001/"
+            ),
+            har_log=HARLog(),
+            payloads=[PayloadArtifact(
+                payload_type="sql_injection",
+                payload_value="1' OR '1'='1",
+                location="query.id",
+                confidence=0.9
+            )]
+        )
+
+    def test_package_is_frozen(self):
+        """Test fields cannot be reassigned after build"""
+        with pytest.raises(ValidationError):
+            self.package.payloads = []
+
+    def test_manifest_reflects_model_copy(self):
+        """Test a copied package reports its own contents, not the original's"""
+        assert self.package.to_manifest()["total_payloads"] == 1
+
+        copied = self.package.model_copy(update={"payloads": []})
+
+        assert copied.to_manifest()["total_payloads"] == 0
+        assert self.package.to_manifest()["total_payloads"] == 1
+
+    def test_manifest_not_shared_between_calls(self):
+        """Test mutating a returned manifest does not leak into later calls"""
+        self.package.to_manifest()["total_payloads"] = 99
+
+        assert self.package.to_manifest()["total_payloads"] == 1
@@ -0,0 +1,66 @@
+"""
+Unit tests for the msgspec HAR decode path
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from pydantic import TypeAdapter
+
+pytest.importorskip("msgspec")
+
+from shared.evidence.builder import EvidenceBuilder
+from shared.evidence.models import HARLog
+from shared.evidence.models_fast import decode_har
+
+
+class TestDecodeHar:
+    """Test suite for decode_har against the Pydantic models"""
+
+    @patch('shared.evidence.builder.get_storage_client')
+    def test_matches_pydantic_validation(self, mock_storage_client):
+        """Test decode_har builds the same HARLog as validating with Pydantic"""
+        mock_storage = MagicMock()
+        mock_storage.upload_bytes.side_effect = lambda bucket, name, data, **kwargs: {
+            "object": name, "size": len(data), "checksum": "0" * 64
+        }
+        mock_storage_client.return_value = mock_storage
+
+        builder = EvidenceBuilder(
+            event_id="evt_fast_001",
+            session_id="sess_fast_001",
+            attacker_ip="203.0.113.42",
+            user_agent="sqlmap/1.5.2"
+        )
+        builder.add_har_entry(
+            method="GET",
+            url="/api/users?id=1",
+            request_headers={"User-Agent": "sqlmap/1.5.2"},
+            request_body="",
+            response_status=200,
+            response_headers={"Content-Type": "application/json"},
+            response_body='{"users": []}',
+            start_time=datetime.utcnow(),
+            duration_ms=12.5
+        )
+        builder.add_har_entry(
+            method="POST",
+            url="/login",
+            request_headers={},
+            request_body="user=admin'--",
+            response_status=500,
+            response_headers={},
+            response_body="error",
+            start_time=datetime.utcnow(),
+            duration_ms=40
+        )
+        builder.build_and_upload(archive=False)
+        data = builder.artifact_files["session.har"]
+
+        decoded = decode_har(data)
+
+        assert decoded == TypeAdapter(HARLog).validate_json(data)
+        assert len(decoded.entries) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
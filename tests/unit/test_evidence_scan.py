@@ -0,0 +1,77 @@
+"""
+Unit tests for Payload Signature Scanning
+"""
+import pytest
+from unittest.mock import patch
+
+from shared.evidence import scan
+from shared.evidence.models import PayloadArtifact
+
+
+SIGNATURES = [rb"union\s+select", rb"<script", rb"\.\./"]
+
+
+class TestRegexFallback:
+    """Test suite for scanning with the ``re`` fallback database"""
+
+    def setup_method(self):
+        """Force the fallback regardless of whether hyperscan is installed"""
+        self.no_hyperscan = patch.object(scan, "hyperscan", None)
+        self.no_hyperscan.start()
+        scan._build_db.cache_clear()
+
+    def teardown_method(self):
+        self.no_hyperscan.stop()
+        scan._build_db.cache_clear()
+
+    def _payload(self, value: str) -> PayloadArtifact:
+        return PayloadArtifact(
+            payload_type="test",
+            payload_value=value,
+            location="query.q",
+            confidence=0.5
+        )
+
+    def test_build_db_accepts_list(self):
+        """Test a list of patterns compiles and hits the cache like a tuple"""
+        db = scan.build_db(list(SIGNATURES))
+
+        assert isinstance(db, scan._RegexDatabase)
+        assert scan.build_db(tuple(SIGNATURES)) is db
+
+    def test_matches_signature(self):
+        """Test a payload matching one signature reports its pattern id"""
+        payload = self._payload("1 UNION SELECT password FROM users")
+
+        results = scan.scan_payloads(scan.build_db(SIGNATURES), [payload])
+
+        assert results == [(payload.artifact_id, 0)]
+
+    def test_matches_attributed_per_payload(self):
+        """Test each match is reported against the payload that contains it"""
+        xss = self._payload("<script>alert(1)</script>")
+        benign = self._payload("hello")
+        traversal = self._payload("../../etc/passwd")
+
+        results = scan.scan_payloads(scan.build_db(SIGNATURES), [xss, benign, traversal])
+
+        assert results == [(xss.artifact_id, 1), (traversal.artifact_id, 2)]
+
+    def test_no_match_across_payload_boundary(self):
+        """Test a signature split over two payloads does not match"""
+        first = self._payload("1 union")
+        second = self._payload("select 2")
+
+        assert scan.scan_payloads(scan.build_db(SIGNATURES), [first, second]) == []
+
+    def test_matching_is_case_insensitive(self):
+        """Test signatures match regardless of payload case"""
+        payload = self._payload("<ScRiPt src=x>")
+
+        results = scan.scan_payloads(scan.build_db(SIGNATURES), [payload])
+
+        assert results == [(payload.artifact_id, 1)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,21 +2,29 @@
 Unit tests for MinIO Storage Client
 """
 import pytest
+import hashlib
 import os
 import tempfile
 from unittest.mock import Mock, patch, MagicMock
 from datetime import timedelta
 
-from shared.storage.minio_client import CerberusStorageClient
+from shared.storage.minio_client import AsyncCerberusStorageClient, CerberusStorageClient, ObjectInfo
+
+
+@pytest.fixture
+def mock_minio_class():
+    """Patch the Minio SDK class for the duration of a test"""
+    with patch('shared.storage.minio_client.Minio') as mock_minio:
+        yield mock_minio
 
 
 class TestMinIOClient:
     """Test suite for MinIO storage client"""
     
-    @patch('shared.storage.minio_client.Minio')
-    def setup_method(self, mock_minio):
+    @pytest.fixture(autouse=True)
+    def setup_client(self, mock_minio_class):
         """Setup test fixtures"""
-        self.mock_minio = mock_minio
+        self.mock_minio = mock_minio_class
         self.client = CerberusStorageClient(
             endpoint="localhost:9000",
             access_key="test_key",
@@ -31,7 +39,6 @@ class TestMinIOClient:
         assert self.client.secret_key == "test_secret"
         assert self.client.secure == False
     
-    @patch('shared.storage.minio_client.Minio')
     def test_ensure_bucket_creates_if_not_exists(self, mock_minio_class):
         """Test bucket creation when it doesn't exist"""
         mock_client = MagicMock()
@@ -45,7 +52,6 @@ class TestMinIOClient:
         mock_client.bucket_exists.assert_called_once_with("test-bucket")
         mock_client.make_bucket.assert_called_once_with("test-bucket")
     
-    @patch('shared.storage.minio_client.Minio')
     def test_ensure_bucket_skips_if_exists(self, mock_minio_class):
         """Test bucket creation skipped when bucket exists"""
         mock_client = MagicMock()
@@ -59,7 +65,6 @@ class TestMinIOClient:
         mock_client.bucket_exists.assert_called_once()
         mock_client.make_bucket.assert_not_called()
     
-    @patch('shared.storage.minio_client.Minio')
     def test_upload_file(self, mock_minio_class):
         """Test file upload"""
         # Create test file
@@ -71,7 +76,14 @@ class TestMinIOClient:
             mock_client = MagicMock()
             mock_result = MagicMock()
             mock_result.etag = "abc123"
-            mock_client.fput_object.return_value = mock_result
+            
+            def put_object(bucket, name, data, length, **kwargs):
+                # Simulate MinIO reading the stream in parts
+                while data.read(4):
+                    pass
+                return mock_result
+            
+            mock_client.put_object.side_effect = put_object
             mock_minio_class.return_value = mock_client
             
             client = CerberusStorageClient()
@@ -84,15 +96,14 @@ class TestMinIOClient:
             assert result["bucket"] == "test-bucket"
             assert result["object"] == "test/file.txt"
             assert result["etag"] == "abc123"
-            assert "checksum" in result
-            assert "size" in result
+            assert result["checksum"] == hashlib.sha256(b"test content").hexdigest()
+            assert result["size"] == len("test content")
             
-            mock_client.fput_object.assert_called_once()
+            mock_client.put_object.assert_called_once()
         
         finally:
             os.unlink(test_file)
     
-    @patch('shared.storage.minio_client.Minio')
     def test_upload_bytes(self, mock_minio_class):
         """Test bytes upload"""
         mock_client = MagicMock()
@@ -116,7 +127,59 @@ class TestMinIOClient:
         assert result["size"] == len(test_data)
         assert "checksum" in result
     
-    @patch('shared.storage.minio_client.Minio')
+    def test_json_upload_compressed_round_trip(self, mock_minio_class):
+        """Test compress=True stores zstd (opt-in) and downloads decompress it"""
+        pytest.importorskip("zstandard")
+        mock_client = MagicMock()
+        stored = {}
+        
+        def mock_put(bucket, obj, stream, length, **kwargs):
+            stored["body"] = stream.read(length)
+            stored["metadata"] = kwargs["metadata"]
+            return MagicMock(etag="abc")
+        
+        mock_client.put_object.side_effect = mock_put
+        mock_minio_class.return_value = mock_client
+        
+        client = CerberusStorageClient()
+        test_data = b'{"entries": [' + b'{"status": 200},' * 200 + b'{}]}'
+        plain = client.upload_bytes("test-bucket", "test/plain.json", test_data,
+                                    content_type="application/json")
+        assert stored["metadata"] == {}
+        assert plain["stored_size"] == len(test_data)
+        
+        result = client.upload_bytes("test-bucket", "test/data.json", test_data,
+                                     content_type="application/json", compress=True)
+        
+        assert stored["metadata"] == {"compression": "zstd"}
+        assert result["stored_size"] == len(stored["body"]) < len(test_data)
+        assert result["checksum"] == hashlib.sha256(test_data).hexdigest()
+        
+        body = stored["body"]
+        mock_response = MagicMock(headers={"x-amz-meta-compression": "zstd"})
+        mock_response.stream.return_value = iter([body[:10], body[10:]])
+        mock_client.get_object.return_value = mock_response
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dest_file = os.path.join(tmpdir, "data.json")
+            download = client.download_and_hash("test-bucket", "test/data.json", dest_file)
+            with open(dest_file, 'rb') as f:
+                assert f.read() == test_data
+        
+        assert download["checksum"] == result["checksum"]
+    
+    def test_part_size_scales_with_object(self, mock_minio_class):
+        """Test large uploads get bigger parts and stay under the S3 part limit"""
+        client = CerberusStorageClient()
+        client.part_size = 64 << 20
+        
+        assert client._pick_part_size(1 << 20) == 64 << 20
+        assert client._pick_part_size(1 << 30) == 64 << 20
+        
+        part_size = client._pick_part_size(1 << 40)
+        assert part_size == 128 << 20
+        assert (1 << 40) / part_size <= 10000
+    
     def test_download_file(self, mock_minio_class):
         """Test file download"""
         mock_client = MagicMock()
@@ -126,37 +189,31 @@ class TestMinIOClient:
             dest_file = f.name
         
         try:
-            # Create source file for testing
-            with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-                f.write("downloaded content")
-                source_file = f.name
-            
-            # Mock will "download" by creating file
-            def mock_fget(bucket, obj, path):
-                with open(path, 'w') as f:
-                    f.write("downloaded content")
-            
-            mock_client.fget_object.side_effect = mock_fget
+            content = b"downloaded content"
+            mock_response = MagicMock()
+            mock_response.stream.return_value = iter([content])
+            mock_client.get_object.return_value = mock_response
             
             client = CerberusStorageClient()
             result = client.download_file(
                 "test-bucket",
                 "test/file.txt",
-                dest_file
+                dest_file,
+                validate_checksum=hashlib.sha256(content).hexdigest()
             )
             
             assert result["bucket"] == "test-bucket"
             assert result["object"] == "test/file.txt"
             assert result["local_path"] == dest_file
-            assert os.path.exists(dest_file)
+            assert "checksum" not in result
+            with open(dest_file, 'rb') as f:
+                assert f.read() == content
+            mock_client.fget_object.assert_not_called()
         
         finally:
             if os.path.exists(dest_file):
                 os.unlink(dest_file)
-            if os.path.exists(source_file):
-                os.unlink(source_file)
     
-    @patch('shared.storage.minio_client.Minio')
     def test_download_bytes(self, mock_minio_class):
         """Test bytes download"""
         mock_client = MagicMock()
@@ -170,10 +227,51 @@ class TestMinIOClient:
         result = client.download_bytes("test-bucket", "test/file.bin")
         
         assert result == test_data
+        mock_client.stat_object.assert_not_called()
         mock_response.close.assert_called_once()
         mock_response.release_conn.assert_called_once()
     
-    @patch('shared.storage.minio_client.Minio')
+    def test_download_bytes_ranged(self, mock_minio_class):
+        """Test large objects are fetched as ranged GETs and reassembled in order"""
+        mock_client = MagicMock()
+        test_data = bytes(range(256)) * 4
+        
+        def mock_get(bucket, obj, offset=0, length=0):
+            response = MagicMock()
+            response.read.return_value = test_data[offset:offset + length]
+            return response
+        
+        mock_client.get_object.side_effect = mock_get
+        mock_minio_class.return_value = mock_client
+        
+        client = CerberusStorageClient()
+        client.get_range_size = 100
+        result = client.download_bytes("test-bucket", "test/file.bin", size=len(test_data))
+        
+        assert result == test_data
+        assert mock_client.get_object.call_count == 11
+        mock_client.stat_object.assert_not_called()
+    
+    def test_download_and_hash(self, mock_minio_class):
+        """Test streamed download writes the file and returns its SHA256"""
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.stream.return_value = iter([b"chunk1", b"chunk2"])
+        mock_client.get_object.return_value = mock_response
+        mock_minio_class.return_value = mock_client
+        
+        client = CerberusStorageClient()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dest_file = os.path.join(tmpdir, "file.bin")
+            result = client.download_and_hash("test-bucket", "test/file.bin", dest_file)
+            
+            with open(dest_file, 'rb') as f:
+                assert f.read() == b"chunk1chunk2"
+        
+        assert result["checksum"] == hashlib.sha256(b"chunk1chunk2").hexdigest()
+        assert result["size"] == 12
+        mock_response.release_conn.assert_called_once()
+    
     def test_list_objects(self, mock_minio_class):
         """Test listing objects"""
         mock_client = MagicMock()
@@ -202,7 +300,27 @@ class TestMinIOClient:
         assert result[0]["size"] == 100
         assert result[1]["name"] == "test/file2.txt"
     
-    @patch('shared.storage.minio_client.Minio')
+    def test_iter_objects_is_lazy(self, mock_minio_class):
+        """Test iter_objects pulls listing entries only as it is consumed"""
+        mock_client = MagicMock()
+        listed = []
+        
+        def mock_list(bucket, prefix=None, recursive=False):
+            for i in range(3):
+                obj = MagicMock(object_name=f"test/file{i}.txt", size=i, last_modified=None, etag=str(i))
+                listed.append(obj)
+                yield obj
+        
+        mock_client.list_objects.side_effect = mock_list
+        mock_minio_class.return_value = mock_client
+        
+        client = CerberusStorageClient()
+        objects = client.iter_objects("test-bucket", prefix="test/")
+        first = next(objects)
+        
+        assert first == ObjectInfo("test/file0.txt", 0, None, "0")
+        assert len(listed) == 1
+    
     def test_delete_object(self, mock_minio_class):
         """Test object deletion"""
         mock_client = MagicMock()
@@ -214,7 +332,27 @@ class TestMinIOClient:
         assert result == True
         mock_client.remove_object.assert_called_once_with("test-bucket", "test/file.txt")
     
-    @patch('shared.storage.minio_client.Minio')
+    def test_delete_objects_batches(self, mock_minio_class):
+        """Test bulk delete goes through remove_objects and reports failures"""
+        mock_client = MagicMock()
+        
+        def mock_remove(bucket, delete_list):
+            names = [d._name for d in delete_list]
+            assert names == ["a", "b", "c"]
+            error = MagicMock(code="AccessDenied", message="denied")
+            error.name = "b"
+            yield error
+        
+        mock_client.remove_objects.side_effect = mock_remove
+        mock_minio_class.return_value = mock_client
+        
+        client = CerberusStorageClient()
+        failed = client.delete_objects("test-bucket", iter(["a", "b", "c"]))
+        
+        assert failed == ["b"]
+        mock_client.remove_objects.assert_called_once()
+        mock_client.remove_object.assert_not_called()
+    
     def test_get_presigned_url(self, mock_minio_class):
         """Test presigned URL generation"""
         mock_client = MagicMock()
@@ -232,5 +370,35 @@ class TestMinIOClient:
         mock_client.presigned_get_object.assert_called_once()
 
 
+class TestAsyncStorageClient:
+    """Test suite for the asyncio storage interface"""
+    
+    @pytest.mark.asyncio
+    async def test_calls_run_off_the_event_loop(self):
+        """Test async methods delegate to the sync client on worker threads"""
+        import asyncio
+        import threading
+        
+        sync_client = MagicMock()
+        threads = []
+        
+        def upload_bytes(bucket, obj, data, content_type="application/octet-stream"):
+            threads.append(threading.current_thread().name)
+            return {"object": obj, "size": len(data)}
+        
+        sync_client.upload_bytes.side_effect = upload_bytes
+        client = AsyncCerberusStorageClient(sync_client, max_workers=4)
+        try:
+            results = await asyncio.gather(*(
+                client.upload_bytes("test-bucket", f"obj{i}", b"x" * i, content_type="text/plain")
+                for i in range(3)
+            ))
+        finally:
+            client.close()
+        
+        assert [r["size"] for r in results] == [0, 1, 2]
+        assert all(name.startswith("minio-async") for name in threads)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,271 @@
+"""
+Unit tests for Payload Simulator
+"""
+import docker
+import pytest
+from unittest.mock import MagicMock
+
+from sentinel.simulator.payload_simulator import (
+    BatchPayloadSimulator, PayloadSimulator, SandboxPool
+)
+
+
+class TestSandboxPool:
+    """Test suite for the warm sandbox pool"""
+
+    def setup_method(self):
+        self.created = []
+        self.destroyed = []
+
+        def factory():
+            sandbox = {"id": f"sb{len(self.created)}"}
+            self.created.append(sandbox)
+            return sandbox
+
+        self.pool = SandboxPool(
+            factory=factory,
+            destroyer=self.destroyed.append,
+            min_warm=0
+        )
+
+    def teardown_method(self):
+        self.pool.close()
+
+    def test_acquire_provisions_when_empty(self):
+        """Test cold acquire provisions inline"""
+        sandbox = self.pool.acquire()
+
+        assert sandbox["id"] == "sb0"
+        assert len(self.created) == 1
+
+    def test_release_reuses_sandbox(self):
+        """Test released sandboxes are handed out again"""
+        sandbox = self.pool.acquire()
+        self.pool.release(sandbox)
+
+        assert self.pool.acquire() is sandbox
+        assert len(self.created) == 1
+
+    def test_expired_sandbox_is_destroyed(self):
+        """Test sandboxes past max age are not reused"""
+        self.pool.max_age_seconds = -1
+        sandbox = self.pool.acquire()
+        self.pool.release(sandbox)
+
+        assert self.destroyed == [sandbox]
+        assert self.pool.size() == 0
+
+    def test_close_destroys_idle(self):
+        """Test close tears down idle sandboxes"""
+        sandbox = self.pool.acquire()
+        self.pool.release(sandbox)
+        self.pool.close()
+
+        assert self.destroyed == [sandbox]
+
+    def test_refill_backs_off_after_failures(self):
+        """Test repeated provisioning failures widen the refill interval"""
+        delays = []
+
+        def failing_factory():
+            raise RuntimeError("image missing")
+
+        def wait(delay):
+            delays.append(delay)
+            if len(delays) == 4:
+                self.pool._stop.set()
+
+        self.pool._factory = failing_factory
+        self.pool.min_warm = 1
+        self.pool.max_backoff_seconds = 5.0
+        self.pool._stop.wait = wait
+
+        self.pool._maintain()
+
+        assert delays == [2.0, 4.0, 5.0, 5.0]
+
+
+class TestPayloadSimulator:
+    """Test suite for simulator sandbox lifecycle"""
+
+    def setup_method(self):
+        self.simulator = PayloadSimulator(docker_client=MagicMock(), min_warm=0)
+        self.simulator._http = MagicMock()
+        self.simulator._http.request.return_value = MagicMock(
+            status_code=200, text='{"users": []}'
+        )
+        self.sandbox = {
+            "id": "abc",
+            "container": MagicMock(),
+            "network": MagicMock(),
+            "base_url": "http://10.0.0.2:5000"
+        }
+        self.sandbox["container"].exec_run.return_value = MagicMock(exit_code=0)
+        self.sandbox["container"].logs.return_value = b""
+        self.simulator._prepare_sandbox = MagicMock(return_value=self.sandbox)
+
+    def teardown_method(self):
+        self.simulator.close()
+
+    def test_sandbox_returned_to_pool(self):
+        """Test a successful simulation keeps its sandbox warm"""
+        payload = {"type": "sql_injection", "value": "1", "confidence": 0.9}
+
+        result = self.simulator.simulate(payload)
+        result_again = self.simulator.simulate(payload)
+
+        assert result["verdict"] == "exploit_improbable"
+        assert result_again["verdict"] == "exploit_improbable"
+        assert self.simulator._prepare_sandbox.call_count == 1
+
+    def test_payload_sent_as_query_param(self):
+        """Test payload values are encoded by the HTTP client, not a shell"""
+        payload = {"type": "sql_injection", "value": "1' OR '1'='1"}
+
+        self.simulator.simulate(payload)
+
+        method, url = self.simulator._http.request.call_args.args
+        assert method == "GET"
+        assert url == "http://10.0.0.2:5000/api/v1/users"
+        assert self.simulator._http.request.call_args.kwargs["params"] == {"id": payload["value"]}
+
+    def test_invalid_payload_rejected(self):
+        """Test non-string payload values never reach the shadow app"""
+        result = self.simulator.simulate({"type": "sql_injection", "value": ["1", "2"]})
+
+        assert result["verdict"] == "error"
+        self.simulator._http.request.assert_not_called()
+        self.simulator._prepare_sandbox.assert_not_called()
+
+    def test_wait_for_container_ip_polls_until_running(self):
+        """Test provisioning waits on container state instead of a fixed sleep"""
+        container = MagicMock(status="created", attrs={"NetworkSettings": {"Networks": {}}})
+        states = iter(["created", "running"])
+
+        def reload():
+            container.status = next(states)
+            if container.status == "running":
+                container.attrs["NetworkSettings"]["Networks"]["sb"] = {"IPAddress": "10.0.0.9"}
+
+        container.reload.side_effect = reload
+
+        ip_address = self.simulator._wait_for_container_ip(container, "sb", interval=0)
+
+        assert ip_address == "10.0.0.9"
+        assert container.reload.call_count == 2
+
+    def test_provision_failure_removes_network(self):
+        """Test a failed container start does not leak the sandbox network"""
+        docker_client = self.simulator.docker_client
+        network = docker_client.networks.create.return_value
+        docker_client.containers.run.side_effect = docker.errors.ImageNotFound("missing")
+
+        with pytest.raises(docker.errors.ImageNotFound):
+            self.simulator._provision_sandbox()
+
+        network.remove.assert_called_once()
+
+    def test_failed_sandbox_is_discarded(self):
+        """Test a sandbox that errored mid-simulation is not reused"""
+        self.sandbox["container"].logs.side_effect = RuntimeError("boom")
+
+        result = self.simulator.simulate({"type": "xss", "value": "<script>"})
+
+        assert result["verdict"] == "error"
+        assert self.simulator._get_pool("main").size() == 0
+        self.sandbox["container"].remove.assert_called_once()
+
+
+class TestBatchPayloadSimulator:
+    """Test suite for concurrent batch simulation"""
+
+    def setup_method(self):
+        self.simulator = PayloadSimulator(docker_client=MagicMock(), min_warm=0)
+        self.batch = BatchPayloadSimulator(self.simulator, max_concurrency=4, retry_base_delay=0)
+
+    def teardown_method(self):
+        self.simulator.close()
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self):
+        """Test batch results line up with the submitted payloads"""
+        self.simulator._run_simulation = lambda payload, ref, start: {
+            "verdict": "exploit_improbable",
+            "execution_time_ms": payload["ms"],
+            "payload": payload
+        }
+        payloads = [{"type": "xss", "ms": ms} for ms in (30, 10, 20)]
+        progress = []
+
+        batch = await self.batch.process_batch(
+            payloads, on_progress=lambda done, total, result: progress.append(done)
+        )
+
+        assert [r["payload"] for r in batch["results"]] == payloads
+        assert progress == [1, 2, 3]
+        assert batch["stats"]["p50_ms"] == 20
+        assert batch["stats"]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self):
+        """Test Docker API errors are retried before giving up"""
+        calls = []
+
+        def flaky(payload, ref, start):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise docker.errors.APIError("daemon busy")
+            return {"verdict": "exploit_possible", "execution_time_ms": 5}
+
+        self.simulator._run_simulation = flaky
+
+        batch = await self.batch.process_batch([{"type": "sql_injection"}])
+
+        assert len(calls) == 2
+        assert batch["results"][0]["verdict"] == "exploit_possible"
+
+
+class TestSimulateCampaign:
+    """Test suite for multi-payload campaigns in one sandbox"""
+
+    def setup_method(self):
+        self.simulator = PayloadSimulator(docker_client=MagicMock(), min_warm=0)
+        self.simulator._http = MagicMock()
+        self.simulator._http.request.return_value = MagicMock(status_code=200, text="")
+        self.container = MagicMock()
+        self.container.exec_run.return_value = MagicMock(exit_code=0)
+        self.container.logs.return_value = b""
+        self.sandbox = {
+            "id": "abc",
+            "container": self.container,
+            "network": MagicMock(),
+            "base_url": "http://10.0.0.2:5000"
+        }
+        self.simulator._prepare_sandbox = MagicMock(return_value=self.sandbox)
+
+    def teardown_method(self):
+        self.simulator.close()
+
+    def test_campaign_shares_one_sandbox(self):
+        """Test all payloads run in a single leased sandbox"""
+        payloads = [{"type": "sql_injection", "value": str(i)} for i in range(3)]
+
+        results = self.simulator.simulate_campaign(payloads)
+
+        assert len(results) == 3
+        assert all(r["verdict"] == "exploit_improbable" for r in results)
+        assert self.simulator._prepare_sandbox.call_count == 1
+
+    def test_failure_is_attributed_to_payload(self):
+        """Test a failing payload gets its own error result"""
+        self.simulator._execute_payload = MagicMock(side_effect=[
+            {"stdout": "", "stderr": "", "exit_code": 0},
+            RuntimeError("exec failed"),
+            {"stdout": "", "stderr": "", "exit_code": 0},
+        ])
+        payloads = [{"type": "xss", "value": str(i)} for i in range(3)]
+
+        results = self.simulator.simulate_campaign(payloads)
+
+        assert [r["verdict"] for r in results] == ["exploit_improbable", "error", "exploit_improbable"]
+        assert self.simulator._get_pool("main").size() == 0
@@ -0,0 +1,282 @@
+"""
+Unit tests for PostgreSQL Client
+"""
+import os
+import weakref
+import pytest
+from unittest.mock import MagicMock, patch
+import psycopg2
+from psycopg2 import pool
+
+from shared.database import postgres_client
+from shared.database.postgres_client import PostgresClient, ThreadLocalPool, _build_insert_sql
+
+
+class TestPostgresClient:
+    """Test suite for PostgreSQL client helpers"""
+
+    def setup_method(self):
+        """Setup client with a mocked connection pool"""
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value
+        self.client = PostgresClient.__new__(PostgresClient)
+        self.client.url = "postgresql://test"
+        self.client.min_conn, self.client.max_conn = 1, 10
+        self.client.cache = None
+        self.client._pid = os.getpid()
+        self.client.prepare = False
+        self.client.max_prepared = 100
+        self.client._prepared = weakref.WeakKeyDictionary()
+        self.client.pool = MagicMock()
+        self.client.pool.getconn.return_value = self.conn
+
+    @patch('shared.database.postgres_client.execute_batch')
+    def test_execute_many_uses_execute_batch(self, mock_execute_batch):
+        """Test execute_many pages statements through execute_batch"""
+        params = [(1,), (2,), (3,)]
+
+        result = self.client.execute_many("UPDATE t SET x = %s", params)
+
+        assert result == True
+        mock_execute_batch.assert_called_once_with(
+            self.cursor, "UPDATE t SET x = %s", params, page_size=500
+        )
+        self.conn.commit.assert_called_once()
+        self.client.pool.putconn.assert_called_once_with(self.conn)
+
+    @patch('shared.database.postgres_client.execute_values')
+    def test_insert_many_builds_values_insert(self, mock_execute_values):
+        """Test insert_many issues a multi-row VALUES insert"""
+        rows = [(1, "a"), (2, "b")]
+
+        result = self.client.insert_many("events", ["id", "name"], rows)
+
+        assert result == True
+        mock_execute_values.assert_called_once_with(
+            self.cursor, "INSERT INTO events (id, name) VALUES %s", rows, page_size=1000
+        )
+        self.conn.commit.assert_called_once()
+
+    @patch('shared.database.postgres_client.execute_values')
+    def test_insert_many_empty_is_noop(self, mock_execute_values):
+        """Test insert_many with no rows never touches the pool"""
+        assert self.client.insert_many("events", ["id"], []) == True
+        mock_execute_values.assert_not_called()
+        self.client.pool.getconn.assert_not_called()
+
+    def test_pipeline_sends_one_query(self):
+        """Test pipelined statements go to the server as a single execute"""
+        self.cursor.mogrify.side_effect = lambda query, params: (query % params).encode()
+
+        with self.client.pipeline() as batch:
+            batch.execute("INSERT INTO a VALUES (%s)", (1,))
+            batch.execute("UPDATE b SET x = %s", (2,))
+
+        self.cursor.execute.assert_called_once_with(
+            b"INSERT INTO a VALUES (1);\nUPDATE b SET x = 2"
+        )
+        self.conn.commit.assert_called_once()
+
+    def test_pipeline_discarded_on_error(self):
+        """Test nothing is sent when the pipeline block raises"""
+        with pytest.raises(ValueError):
+            with self.client.pipeline() as batch:
+                batch.execute("INSERT INTO a VALUES (1)")
+                raise ValueError("abort")
+
+        self.cursor.execute.assert_not_called()
+        self.conn.commit.assert_not_called()
+        self.conn.rollback.assert_called_once()
+
+    @patch('shared.database.postgres_client.ThreadLocalPool')
+    def test_pool_sized_from_env(self, mock_pool_class):
+        """Test pool bounds come from POSTGRES_POOL_MIN/MAX"""
+        with patch.dict(os.environ, {"POSTGRES_POOL_MIN": "2", "POSTGRES_POOL_MAX": "20"}):
+            client = PostgresClient(url="postgresql://test")
+
+        mock_pool_class.assert_called_once_with(2, 20, "postgresql://test")
+        assert client.pool is mock_pool_class.return_value
+
+    @patch('shared.database.postgres_client.ThreadLocalPool')
+    def test_pool_recreated_after_fork(self, mock_pool_class):
+        """Test a forked process opens its own pool and keeps the parent's referenced"""
+        inherited = self.client.pool
+        self.client._pid = -1
+
+        with self.client.get_connection():
+            pass
+
+        assert any(pool is inherited for pool in postgres_client._inherited_pools)
+        assert self.client.pool is mock_pool_class.return_value
+        assert self.client._pid == os.getpid()
+
+    def test_fetch_dict_iter_uses_named_cursor(self):
+        """Test streaming reads go through a server-side cursor"""
+        self.cursor.__iter__.return_value = iter([{"id": 1}, {"id": 2}])
+
+        rows = list(self.client.fetch_dict_iter("SELECT id FROM t", itersize=50))
+
+        assert rows == [{"id": 1}, {"id": 2}]
+        assert self.conn.cursor.call_args.kwargs["name"].startswith("ttrace_")
+        assert self.cursor.itersize == 50
+        self.cursor.close.assert_called_once()
+        self.client.pool.putconn.assert_called_once_with(self.conn)
+
+    def test_fetch_dict_iter_releases_on_early_close(self):
+        """Test abandoning the iterator still returns the connection"""
+        self.cursor.__iter__.return_value = iter([{"id": 1}, {"id": 2}])
+
+        rows = self.client.fetch_dict_iter("SELECT id FROM t")
+        next(rows)
+        rows.close()
+
+        self.cursor.close.assert_called_once()
+        self.conn.rollback.assert_called_once()
+        self.client.pool.putconn.assert_called_once_with(self.conn)
+
+    def test_fetch_dict_iter_raises_mid_stream(self):
+        """Test an error after some rows propagates instead of truncating"""
+        def rows():
+            yield {"id": 1}
+            raise psycopg2.OperationalError("server closed the connection")
+
+        self.cursor.__iter__.return_value = rows()
+
+        received = []
+        with pytest.raises(psycopg2.OperationalError):
+            for row in self.client.fetch_dict_iter("SELECT id FROM t"):
+                received.append(row)
+
+        assert received == [{"id": 1}]
+        self.cursor.close.assert_called_once()
+        self.client.pool.putconn.assert_called_once_with(self.conn)
+
+    def test_fetch_all_cached_serves_repeat_from_cache(self):
+        """Test a cached read skips Postgres on the second call"""
+        store = {}
+        cache = MagicMock()
+        cache.get.side_effect = lambda key, as_json=False: store.get(key)
+        cache.set.side_effect = lambda key, value, ttl=None: store.__setitem__(key, value)
+        self.client.cache = cache
+        self.cursor.fetchall.return_value = [(1, "a")]
+
+        first = self.client.fetch_all_cached("SELECT id, name FROM t WHERE id = %s", (1,), tables=("t",))
+        second = self.client.fetch_all_cached("SELECT id, name FROM t WHERE id = %s", (1,), tables=("t",))
+
+        assert first == second == [(1, "a")]
+        self.cursor.execute.assert_called_once()
+
+    def test_fetch_all_cached_skips_non_deterministic(self):
+        """Test queries using now() are never cached"""
+        self.client.cache = MagicMock()
+        self.cursor.fetchall.return_value = [(1,)]
+
+        self.client.fetch_all_cached("SELECT count(*) FROM t WHERE ts > now() - interval '1 hour'")
+
+        self.client.cache.get.assert_not_called()
+        self.client.cache.set.assert_not_called()
+
+    def test_cache_invalidate_drops_table_keys(self):
+        """Test invalidation deletes every key tagged with the table"""
+        self.client.cache = MagicMock()
+        self.client.cache.smembers.return_value = {"pgcache:abc"}
+
+        self.client.cache_invalidate(["t"])
+
+        self.client.cache.delete.assert_called_once_with("pgcache:abc", "pgcache:table:t")
+
+    def test_writes_invalidate_table_cache(self):
+        """Test update() drops cached reads of the table it writes"""
+        self.client.cache = MagicMock()
+        self.client.cache.smembers.return_value = {"pgcache:abc"}
+
+        self.client.update("t", {"name": "x"}, "id = %s", (1,))
+
+        self.client.cache.smembers.assert_called_once_with("pgcache:table:t")
+        self.client.cache.delete.assert_called_once_with("pgcache:abc", "pgcache:table:t")
+
+    def test_prepared_statement_reused_per_connection(self):
+        """Test PREPARE runs once per connection and repeats only EXECUTE"""
+        query = "SELECT id FROM t WHERE name = %s AND tag LIKE 'a%%'"
+
+        self.client.execute(query, ("x",), fetch=True, prepare=True)
+        self.client.execute(query, ("y",), fetch=True, prepare=True)
+
+        calls = [c.args for c in self.cursor.execute.call_args_list]
+        assert len(calls) == 3
+        assert calls[0][0].startswith("PREPARE ttrace_")
+        assert calls[0][0].endswith("AS SELECT id FROM t WHERE name = $1 AND tag LIKE 'a%'")
+        name = calls[0][0].split()[1]
+        assert calls[1] == (f"EXECUTE {name} (%s)", ("x",))
+        assert calls[2] == (f"EXECUTE {name} (%s)", ("y",))
+
+    def test_prepared_statements_evicted_past_cap(self):
+        """Test the least recently used statement is deallocated at the cap"""
+        self.client.max_prepared = 2
+
+        for query in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"):
+            self.client.execute(query, fetch=True, prepare=True)
+
+        statements = [c.args[0] for c in self.cursor.execute.call_args_list]
+        first, second = statements[0].split()[1], statements[2].split()[1]
+        assert f"DEALLOCATE {second}" in statements
+        assert list(self.client._prepared[self.conn]) == [first, statements[-1].split()[1]]
+
+    def test_crud_helpers_not_prepared_by_default(self):
+        """Test insert runs as a plain statement unless prepare is enabled"""
+        self.cursor.fetchone.return_value = (7,)
+
+        assert self.client.insert("events", {"name": "x"}) == 7
+
+        self.cursor.execute.assert_called_once_with(
+            "INSERT INTO events (name) VALUES (%s) RETURNING id", ("x",)
+        )
+
+    def test_insert_sql_template_cached(self):
+        """Test insert SQL is built once per (table, columns), identifiers left unquoted"""
+        first = _build_insert_sql("public.events", ("id", "Name"))
+        second = _build_insert_sql("public.events", ("id", "Name"))
+
+        assert first is second
+        assert first == "INSERT INTO public.events (id, Name) VALUES (%s, %s) RETURNING id"
+
+
+class TestThreadLocalPool:
+    """Test suite for the thread-affine LIFO pool"""
+
+    def setup_method(self):
+        self.connect = patch('shared.database.postgres_client.psycopg2.connect',
+                             side_effect=lambda dsn: MagicMock(closed=0))
+        self.connect.start()
+        self.pool = ThreadLocalPool(0, 2, "postgresql://test", healthcheck_interval=0)
+
+    def teardown_method(self):
+        self.connect.stop()
+
+    def test_thread_reclaims_last_connection(self):
+        """Test a thread gets back the connection it returned"""
+        first = self.pool.getconn()
+        second = self.pool.getconn()
+        self.pool.putconn(first)
+        self.pool.putconn(second)
+
+        assert self.pool.getconn() is second
+
+    def test_exhausted_raises_pool_error(self):
+        """Test maxconn is enforced like ThreadedConnectionPool"""
+        self.pool.getconn()
+        self.pool.getconn()
+
+        with pytest.raises(pool.PoolError):
+            self.pool.getconn()
+
+    def test_healthcheck_drops_stale_connection(self):
+        """Test the reaper closes idle connections that fail a ping"""
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = Exception("gone")
+
+        self.pool.healthcheck()
+
+        conn.close.assert_called_once()
+        assert self.pool.getconn() is not conn
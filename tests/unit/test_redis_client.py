@@ -0,0 +1,73 @@
+"""
+Unit tests for Redis Client
+"""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from shared.database.redis_client import RedisClient
+
+
+class TestRedisClient:
+    """Test suite for Redis client batching helpers"""
+
+    def setup_method(self):
+        """Setup client with a mocked redis connection"""
+        self.redis = MagicMock()
+        with patch('shared.database.redis_client.redis.from_url', return_value=self.redis):
+            self.client = RedisClient(url="redis://localhost:6379")
+        self.pipe = self.redis.pipeline.return_value.__enter__.return_value
+
+    def test_mget_parses_json(self):
+        """Test mget fetches all keys in one call and parses JSON"""
+        self.redis.mget.return_value = ['{"a": 1}', None]
+
+        values = self.client.mget(["k1", "k2"], as_json=True)
+
+        assert values == [{"a": 1}, None]
+        self.redis.mget.assert_called_once_with(["k1", "k2"])
+
+    def test_mset_without_ttl_uses_mset(self):
+        """Test mset serializes values into a single MSET"""
+        self.client.mset({"k1": {"a": 1}, "k2": "v"})
+
+        self.redis.mset.assert_called_once()
+        mapping = self.redis.mset.call_args.args[0]
+        assert json.loads(mapping["k1"]) == {"a": 1}
+        assert mapping["k2"] == "v"
+
+    def test_mset_with_ttl_pipelines_set_ex(self):
+        """Test mset with a TTL queues SET EX per key in one pipeline"""
+        assert self.client.mset({"k1": "a", "k2": "b"}, ttl=60) == True
+
+        self.pipe.set.assert_any_call("k1", "a", ex=60)
+        self.pipe.set.assert_any_call("k2", "b", ex=60)
+        self.pipe.execute.assert_called_once()
+
+    def test_pipeline_not_sent_on_error(self):
+        """Test queued commands are dropped if the block raises"""
+        with pytest.raises(RuntimeError):
+            with self.client.pipeline() as pipe:
+                pipe.incr("counter")
+                raise RuntimeError("abort")
+
+        self.pipe.execute.assert_not_called()
+
+    def test_push_serializes_only_containers(self):
+        """Test list pushes JSON-encode dicts/lists and pass strings through"""
+        self.client.rpush("k", "a", {"b": 1}, [2])
+        self.client.lpush("k", "x", "y")
+
+        self.redis.rpush.assert_called_once()
+        key, first, *encoded = self.redis.rpush.call_args.args
+        assert (key, first) == ("k", "a")
+        assert [json.loads(value) for value in encoded] == [{"b": 1}, [2]]
+        self.redis.lpush.assert_called_once_with("k", "x", "y")
+
+    def test_keys_uses_scan(self):
+        """Test key enumeration uses SCAN and drops rehash duplicates"""
+        self.redis.scan_iter.return_value = iter(["a", "b", "a"])
+
+        assert self.client.keys("session:*") == ["a", "b"]
+        self.redis.scan_iter.assert_called_once_with(match="session:*", count=1000)
+        self.redis.keys.assert_not_called()